@@ -23,10 +23,12 @@ RAW_DIR = DATA_DIR / 'raw'
 OUTPUT_DIR = DATA_DIR / 'output'
 NATURAL_EARTH_DIR = RAW_DIR / 'natural_earth'
 OOKLA_DIR = RAW_DIR / 'ookla'
+CACHE_DIR = DATA_DIR / 'cache'
 
 # Ensure directories exist
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 OOKLA_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # ═══════════════════════════════════════════════════════════════════
 # REGION PRESETS
@@ -97,6 +99,9 @@ REGION_PRESETS = {
 
 OOKLA_CONFIG = {
     'base_url': 's3://ookla-open-data/parquet/performance',
+    's3_region': 'us-west-2',  # Region of the public ookla-open-data bucket
+    'tile_size_deg': 0.01,  # Upper bound on a zoom-16 tile's width/height
+    'max_parallel_downloads': 4,  # Quarters/types fetched at once by download_multiple
     'data_types': ['mobile', 'fixed'],
     'available_years': list(range(2019, 2026)),  # 2019-2025
     'available_quarters': [1, 2, 3, 4],
@@ -119,6 +124,10 @@ TABLEAU_CONFIG = {
     'excel_row_limit': 900000,  # Keep under 1M Excel limit
     'include_statistics': True,
     'create_separate_sheets': True,  # Mobile and Fixed in separate files
+    'fast_writer': True,  # Stream sheet XML directly instead of via xlsxwriter
+    'zip_compresslevel': 1,  # Deflate level (0-9) for the fast writer's .xlsx
+    'format': 'xlsx',  # 'xlsx', 'parquet' or 'csv.gz' (much faster to write)
+    'excel_preview_rows': 50000,  # xlsx preview for parquet/csv.gz (0 = none)
 }
 
 # ═══════════════════════════════════════════════════════════════════
@@ -5,9 +5,151 @@ This module provides classes to load and process geographic and connectivity dat
 for the Capstone Ookla connectivity analysis project.
 """
 
+import collections
+import functools
+import logging
+import os
+
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from shapely.prepared import prep
+
+logger = logging.getLogger(__name__)
+
+
+# Resolved once at import; resolve() stats every path component
+if '__file__' in globals():
+    # Running as a module
+    _PROJECT_ROOT = Path(__file__).resolve().parent.parent
+else:
+    # Running in notebook - go up from current directory
+    _PROJECT_ROOT = Path.cwd().resolve().parent
+
+
+def _ensure_parquet(shp_path, columns):
+    """
+    Return a GeoParquet copy of a shapefile, converting it on first use
+    
+    The cache lives next to the shapefile (same stem, .parquet suffix) and
+    holds only the requested columns. It is rebuilt when the shapefile is
+    newer than the cache.
+    
+    Parameters:
+        shp_path (Path): Path to the source shapefile
+        columns (list of str): Columns to keep (including 'geometry')
+    
+    Returns:
+        Path: Path to the GeoParquet cache
+    """
+    parquet_path = shp_path.with_suffix('.parquet')
+    
+    if (not parquet_path.exists()
+            or parquet_path.stat().st_mtime < shp_path.stat().st_mtime):
+        logger.info("🗜️  Caching %s as GeoParquet...", shp_path.name)
+        attribute_cols = [c for c in columns if c != 'geometry']
+        gdf = gpd.read_file(str(shp_path), columns=attribute_cols)
+        gdf[columns].to_parquet(parquet_path)
+    
+    return parquet_path
+
+
+def _ensure_simplified_parquet(shp_path, columns, tolerance):
+    """
+    Return a GeoParquet copy of a shapefile with simplified geometries
+    
+    Cached next to the shapefile as <stem>_simp<tolerance>.parquet and rebuilt
+    when the shapefile is newer than the cache.
+    
+    Parameters:
+        shp_path (Path): Path to the source shapefile
+        columns (list of str): Columns to keep (including 'geometry')
+        tolerance (float): Simplification tolerance in degrees
+    
+    Returns:
+        Path: Path to the simplified GeoParquet cache
+    """
+    simplified_path = shp_path.with_name(f"{shp_path.stem}_simp{tolerance}.parquet")
+    
+    if (not simplified_path.exists()
+            or simplified_path.stat().st_mtime < shp_path.stat().st_mtime):
+        logger.info("✂️  Simplifying %s (tolerance=%s)...", shp_path.name, tolerance)
+        gdf = gpd.read_parquet(_ensure_parquet(shp_path, columns), columns=columns)
+        gdf['geometry'] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+        gdf.to_parquet(simplified_path)
+    
+    return simplified_path
+
+
+def _build_name_index(names):
+    """
+    Map each name to the row positions where it occurs
+    
+    Parameters:
+        names (array-like): Column values, in row order
+    
+    Returns:
+        dict: {name: list of int row positions}
+    """
+    index = collections.defaultdict(list)
+    for position, name in enumerate(names):
+        index[name].append(position)
+    return dict(index)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_shapefile_cached(path_str, columns, tolerance=None):
+    """
+    Load a shapefile's GeoParquet cache once per process
+    
+    Keyed on the resolved shapefile path so every NaturalEarthLoader instance
+    shares the same parsed GeoDataFrame. Callers must treat the result as
+    read-only and copy before modifying.
+    
+    Parameters:
+        path_str (str): Resolved path to the shapefile
+        columns (tuple of str): Columns to load (including 'geometry')
+        tolerance (float, optional): If set, load geometries simplified
+            with this tolerance
+    
+    Returns:
+        GeoDataFrame: Boundaries with the requested columns
+    """
+    columns = list(columns)
+    if tolerance is None:
+        parquet_path = _ensure_parquet(Path(path_str), columns)
+    else:
+        parquet_path = _ensure_simplified_parquet(Path(path_str), columns, tolerance)
+    return gpd.read_parquet(parquet_path, columns=columns, use_threads=True)
+
+
+# Regional province groupings by country, used by get_region_preset()
+_COUNTRY_REGION_PRESETS = {
+    'Indonesia': {
+        'sumatra': (
+            'Aceh', 'Sumatera Utara', 'Sumatera Barat', 'Riau',
+            'Jambi', 'Sumatera Selatan', 'Bengkulu', 'Lampung',
+            'Kepulauan Bangka Belitung', 'Kepulauan Riau'
+        ),
+        'java': (
+            'Banten', 'DKI Jakarta', 'Jawa Barat', 'Jawa Tengah',
+            'DI Yogyakarta', 'Jawa Timur'
+        ),
+        'kalimantan': (
+            'Kalimantan Barat', 'Kalimantan Tengah', 'Kalimantan Selatan',
+            'Kalimantan Timur', 'Kalimantan Utara'
+        ),
+        'sulawesi': (
+            'Sulawesi Utara', 'Sulawesi Tengah', 'Sulawesi Selatan',
+            'Sulawesi Tenggara', 'Gorontalo', 'Sulawesi Barat'
+        ),
+        'eastern': (
+            'Bali', 'Nusa Tenggara Barat', 'Nusa Tenggara Timur',
+            'Maluku', 'Maluku Utara', 'Papua', 'Papua Barat'
+        ),
+    }
+}
 
 
 class NaturalEarthLoader:
@@ -21,7 +163,9 @@ class NaturalEarthLoader:
         data_dir (Path): Directory containing Natural Earth data
         current_country (str): Currently selected country name
         current_country_geometry (GeoDataFrame): Currently selected country boundary
-        current_provinces (GeoDataFrame): Currently loaded provinces
+        current_country_geometry_unary (Geometry): Union of the current country boundary
+        prepared_country (PreparedGeometry): Prepared union for fast contains() checks
+        current_provinces (GeoDataFrame): Currently loaded provinces (spatial index prebuilt)
         
     Example:
         >>> loader = NaturalEarthLoader()
@@ -30,34 +174,27 @@ class NaturalEarthLoader:
         >>> sumatra = loader.get_provinces_by_name(['Aceh', 'Sumatera Utara'])
     """
     
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, tolerance=None):
         """
         Initialize the Natural Earth data loader
         
         Parameters:
             data_dir (str or Path, optional): Path to Natural Earth data directory.
                 If None, automatically detects based on project structure.
+            tolerance (float, optional): Simplify province geometries with this
+                tolerance (degrees, e.g. 0.01) for plotting and fast predicates.
+                If None, uses full 10m resolution.
         """
         if data_dir is None:
-            # Auto-detect project root
-            if '__file__' in globals():
-                # Running as a module
-                current_file = Path(__file__).resolve()
-                project_root = current_file.parent.parent
-            else:
-                # Running in notebook - go up from current directory
-                project_root = Path.cwd().resolve().parent
-            
-            self.data_dir = project_root / 'data' / 'raw' / 'natural_earth'
+            # _PROJECT_ROOT is already resolved; joining literal segments keeps it absolute
+            self.data_dir = _PROJECT_ROOT / 'data' / 'raw' / 'natural_earth'
         else:
-            self.data_dir = Path(data_dir)
-        
-        # Ensure absolute path
-        self.data_dir = self.data_dir.resolve()
+            # Ensure absolute path (user input may be relative or contain '..')
+            self.data_dir = Path(data_dir).resolve()
+        self.tolerance = tolerance
         
-        print(f"📁 NaturalEarthLoader initialized")
-        print(f"   Data directory: {self.data_dir}")
-        print(f"   Directory exists: {self.data_dir.exists()}")
+        logger.debug("📁 NaturalEarthLoader initialized")
+        logger.debug("   Data directory: %s", self.data_dir)
         
         # Validate directory exists
         if not self.data_dir.exists():
@@ -73,22 +210,35 @@ class NaturalEarthLoader:
         # Private attributes for lazy loading
         self._countries = None
         self._provinces = None
+        self._country_idx = None
+        self._country_names_sorted = None
+        self._prov_idx = None
+        self._missing_name_cache = {}  # {country_name: error message}
         
         # Current country context
         self.current_country = None
         self.current_country_geometry = None
+        self.current_country_geometry_unary = None
+        self.prepared_country = None
         self.current_provinces = None
+        self._province_names_sorted = None
+        self._formatted_province_list = None
     
     @property
     def countries(self):
         """
         Lazy load country boundaries
         
+        The frame is shared between loader instances; do not modify it in place.
+        
         Returns:
             GeoDataFrame: All country boundaries from Natural Earth
         """
         if self._countries is None:
             self._countries = self._load_countries()
+            self._country_idx = _build_name_index(self._countries['NAME'].values)
+            # NAME is unique in Natural Earth admin_0, no need for unique()
+            self._country_names_sorted = sorted(self._countries['NAME'].values.tolist())
         return self._countries
     
     @property
@@ -96,11 +246,14 @@ class NaturalEarthLoader:
         """
         Lazy load province/state boundaries
         
+        The frame is shared between loader instances; do not modify it in place.
+        
         Returns:
             GeoDataFrame: All province boundaries from Natural Earth
         """
         if self._provinces is None:
             self._provinces = self._load_provinces()
+            self._prov_idx = _build_name_index(self._provinces['admin'].values)
         return self._provinces
     
     def _load_countries(self):
@@ -117,19 +270,19 @@ class NaturalEarthLoader:
         
         if not path.exists():
             # Try to help user find the file
-            print(f"❌ Not found: {path}")
+            logger.error("❌ Not found: %s", path)
             cultural_dir = self.data_dir / '10m_cultural'
             if cultural_dir.exists():
-                print(f"\n📁 Available shapefiles:")
+                logger.error("📁 Available shapefiles:")
                 for f in sorted(cultural_dir.glob('*countries*.shp')):
-                    print(f"   - {f.name}")
+                    logger.error("   - %s", f.name)
             raise FileNotFoundError(
                 f"Countries shapefile not found at: {path}\n"
                 f"Expected structure: {self.data_dir}/10m_cultural/ne_10m_admin_0_countries.shp"
             )
         
-        print(f"✅ Loading countries from: {path.name}")
-        return gpd.read_file(str(path))
+        logger.debug("✅ Loading countries from: %s", path.name)
+        return _load_shapefile_cached(str(path), ('NAME', 'geometry'))
     
     def _load_provinces(self):
         """
@@ -149,8 +302,30 @@ class NaturalEarthLoader:
                 f"Expected structure: {self.data_dir}/10m_cultural/ne_10m_admin_1_states_provinces.shp"
             )
         
-        print(f"✅ Loading provinces from: {path.name}")
-        return gpd.read_file(str(path))
+        logger.debug("✅ Loading provinces from: %s", path.name)
+        return _load_shapefile_cached(
+            str(path), ('admin', 'name', 'geometry'), self.tolerance
+        )
+    
+    def _country_not_found(self, country_name):
+        """
+        Build the error for an unknown country, reusing the message on repeat misses
+        
+        Parameters:
+            country_name (str): Country name that was not found
+        
+        Returns:
+            ValueError: Error to raise
+        """
+        message = self._missing_name_cache.get(country_name)
+        if message is None:
+            available = self._country_names_sorted[:20]
+            message = (
+                f"❌ Country '{country_name}' not found.\n"
+                f"   Sample available countries: {available}"
+            )
+            self._missing_name_cache[country_name] = message
+        return ValueError(message)
     
     def set_country(self, country_name):
         """
@@ -170,41 +345,55 @@ class NaturalEarthLoader:
             >>> loader.set_country('Indonesia')
             >>> provinces = loader.get_provinces()
         """
-        print(f"\n🌍 Setting country context: {country_name}")
-        print("=" * 60)
+        logger.debug("🌍 Setting country context: %s", country_name)
         
         # Load country boundary
-        self.current_country_geometry = self.countries[
-            self.countries['NAME'] == country_name
+        countries = self.countries
+        self.current_country_geometry = countries.iloc[
+            self._country_idx.get(country_name, [])
         ].copy()
         
         if len(self.current_country_geometry) == 0:
-            available = sorted(self.countries['NAME'].unique()[:20])
-            raise ValueError(
-                f"❌ Country '{country_name}' not found.\n"
-                f"   Sample available countries: {available}"
-            )
+            raise self._country_not_found(country_name)
         
+        self._missing_name_cache.clear()
         self.current_country = country_name
-        print(f"✅ Country loaded: {country_name}")
+        geometry = self.current_country_geometry.geometry
+        if hasattr(geometry, 'union_all'):
+            self.current_country_geometry_unary = geometry.union_all()
+        else:
+            self.current_country_geometry_unary = geometry.unary_union
+        self.prepared_country = prep(self.current_country_geometry_unary)
+        logger.debug("✅ Country loaded: %s", country_name)
         
         # Load provinces for this country
-        self.current_provinces = self.provinces[
-            self.provinces['admin'] == country_name
+        provinces = self.provinces
+        self.current_provinces = provinces.iloc[
+            self._prov_idx.get(country_name, [])
         ].copy()
         
+        # Categorical names make isin() compare integer codes, not strings
+        self.current_provinces['name'] = self.current_provinces['name'].astype('category')
+        self._province_names_sorted = sorted(
+            self.current_provinces['name'].cat.categories.tolist()
+        )
+        self._formatted_province_list = None
         
-        print(f"✅ Loaded {len(self.current_provinces)} provinces")
-        print("=" * 60)
+        # Build the STR-tree now so later spatial joins only query it
+        _ = self.current_provinces.sindex
+        
+        logger.info("✅ %s: loaded %d provinces", country_name, len(self.current_provinces))
         
         return self
     
-    def get_country(self, country_name=None):
+    def get_country(self, country_name=None, *, copy=False):
         """
         Get boundary for a specific country
         
         Parameters:
             country_name (str, optional): Name of country. If None, returns current country.
+            copy (bool): If True, return an independent copy. Pass copy=True
+                before modifying the result in place.
         
         Returns:
             GeoDataFrame: Country boundary
@@ -222,27 +411,27 @@ class NaturalEarthLoader:
                     "❌ No country context set!\n"
                     "   Use: loader.set_country('CountryName')"
                 )
-            return self.current_country_geometry
+            result = self.current_country_geometry
+            return result.copy() if copy else result
         
         # Load specific country without changing context
-        result = self.countries[self.countries['NAME'] == country_name].copy()
+        countries = self.countries
+        result = countries.iloc[self._country_idx.get(country_name, [])]
         
         if len(result) == 0:
-            available = sorted(self.countries['NAME'].unique()[:20])
-            raise ValueError(
-                f"❌ Country '{country_name}' not found.\n"
-                f"   Sample available countries: {available}"
-            )
+            raise self._country_not_found(country_name)
         
-        print(f"✅ Found country: {country_name}")
-        return result
+        logger.debug("✅ Found country: %s", country_name)
+        return result.copy() if copy else result
     
-    def get_provinces(self, country_name=None):
+    def get_provinces(self, country_name=None, *, copy=False):
         """
         Get provinces for current or specified country
         
         Parameters:
             country_name (str, optional): Country name. If None, uses current country.
+            copy (bool): If True, return an independent copy. Pass copy=True
+                before modifying the result in place.
         
         Returns:
             GeoDataFrame: Province boundaries
@@ -259,10 +448,12 @@ class NaturalEarthLoader:
                     "❌ No country context set!\n"
                     "   Use: loader.set_country('CountryName')"
                 )
-            return self.current_provinces
+            result = self.current_provinces
+            return result.copy() if copy else result
         
         # Load provinces for specific country
-        result = self.provinces[self.provinces['admin'] == country_name].copy()
+        provinces = self.provinces
+        result = provinces.iloc[self._prov_idx.get(country_name, [])]
         
         if len(result) == 0:
             raise ValueError(
@@ -270,10 +461,10 @@ class NaturalEarthLoader:
                 f"   Check spelling or try get_country() first"
             )
         
-        print(f"✅ Found {len(result)} provinces for {country_name}")
-        return result
+        logger.debug("✅ Found %d provinces for %s", len(result), country_name)
+        return result.copy() if copy else result
 
-    def get_provinces_by_name(self, province_names):
+    def get_provinces_by_name(self, province_names, verbose=False):
         """
         Get specific provinces by name from current country
         
@@ -281,6 +472,8 @@ class NaturalEarthLoader:
         
         Parameters:
             province_names (list of str or str): Province name(s) to select
+            verbose (bool): If True, list every province in the country when
+                some names are not found. Default False.
         
         Returns:
             GeoDataFrame: Selected province boundaries
@@ -304,41 +497,66 @@ class NaturalEarthLoader:
         if isinstance(province_names, str):
             province_names = [province_names]
         
+        # Drop names that cannot match, then compare integer category codes
+        names = (
+            province_names if isinstance(province_names, frozenset)
+            else frozenset(province_names)
+        )
+        province_codes = self.current_provinces['name'].cat
+        categories = province_codes.categories
+        known_names = [n for n in names if n in categories]
+        known_codes = categories.get_indexer(known_names)
+        mask = np.isin(province_codes.codes.to_numpy(), known_codes)
+        
         # Filter from current provinces
-        selected = self.current_provinces[
-            self.current_provinces['name'].isin(province_names)
-        ].copy()
+        selected = self.current_provinces.iloc[mask].copy()
         
         found_count = len(selected)
         expected_count = len(province_names)
         
-        print(f"✅ Found {found_count}/{expected_count} province(s) in {self.current_country}")
+        logger.debug("✅ Found %d/%d province(s) in %s",
+                     found_count, expected_count, self.current_country)
         
         if found_count < expected_count:
-            missing = set(province_names) - set(selected['name'].values)
-            all_provinces = sorted(self.current_provinces['name'].unique())
-            print(f"⚠️  Missing provinces: {missing}")
-            print(f"   Available provinces in {self.current_country} (Total: {len(all_provinces)}):")
-            
-            # Display all provinces in 3 columns
+            missing = set(province_names) - set(known_names)
+            logger.warning("⚠️  Missing provinces in %s: %s", self.current_country, missing)
+            if verbose:
+                print(self._format_province_list())
+            else:
+                logger.warning("   Use verbose=True or list_provinces() to see available names")
+        
+        return selected
+    
+    def _format_province_list(self):
+        """
+        Format the current country's provinces in 3 columns (cached per country)
+        
+        Returns:
+            str: Printable province listing
+        """
+        if self._formatted_province_list is None:
+            all_provinces = self._province_names_sorted
             cols = 3
             rows = (len(all_provinces) + cols - 1) // cols
+            lines = [
+                f"   Available provinces in {self.current_country} (Total: {len(all_provinces)}):"
+            ]
             for i in range(rows):
-                line = ""
-                for j in range(cols):
-                    idx = i + j * rows
-                    if idx < len(all_provinces):
-                        line += f"     {all_provinces[idx]:<30}"
-                print(line.rstrip())
-        
-        return selected
+                line = "".join(
+                    f"     {all_provinces[idx]:<30}"
+                    for idx in range(i, len(all_provinces), rows)
+                )
+                lines.append(line.rstrip())
+            self._formatted_province_list = "\n".join(lines)
+        return self._formatted_province_list
 
-    def get_states_by_name(self, state_names):
+    def get_states_by_name(self, state_names, verbose=False):
         """
         Alias for get_provinces_by_name (for US-style terminology)
         
         Parameters:
             state_names (list of str or str): State name(s) to select
+            verbose (bool): If True, list every state when some are not found
         
         Returns:
             GeoDataFrame: Selected state boundaries
@@ -348,7 +566,7 @@ class NaturalEarthLoader:
             >>> loader.set_country('United States of America')
             >>> states = loader.get_states_by_name(['California', 'Texas'])
         """
-        return self.get_provinces_by_name(state_names)
+        return self.get_provinces_by_name(state_names, verbose=verbose)
 
     def list_provinces(self, search_term=None):
         """
@@ -372,7 +590,7 @@ class NaturalEarthLoader:
                 "   Use: loader.set_country('CountryName') first"
             )
         
-        names = sorted(self.current_provinces['name'].unique())
+        names = list(self._province_names_sorted)
         
         if search_term:
             names = [n for n in names if search_term.lower() in n.lower()]
@@ -407,41 +625,14 @@ class NaturalEarthLoader:
                 "   Use: loader.set_country('CountryName') first"
             )
         
-        # Define presets by country
-        presets = {
-            'Indonesia': {
-                'sumatra': [
-                    'Aceh', 'Sumatera Utara', 'Sumatera Barat', 'Riau',
-                    'Jambi', 'Sumatera Selatan', 'Bengkulu', 'Lampung',
-                    'Kepulauan Bangka Belitung', 'Kepulauan Riau'
-                ],
-                'java': [
-                    'Banten', 'DKI Jakarta', 'Jawa Barat', 'Jawa Tengah',
-                    'DI Yogyakarta', 'Jawa Timur'
-                ],
-                'kalimantan': [
-                    'Kalimantan Barat', 'Kalimantan Tengah', 'Kalimantan Selatan',
-                    'Kalimantan Timur', 'Kalimantan Utara'
-                ],
-                'sulawesi': [
-                    'Sulawesi Utara', 'Sulawesi Tengah', 'Sulawesi Selatan',
-                    'Sulawesi Tenggara', 'Gorontalo', 'Sulawesi Barat'
-                ],
-                'eastern': [
-                    'Bali', 'Nusa Tenggara Barat', 'Nusa Tenggara Timur',
-                    'Maluku', 'Maluku Utara', 'Papua', 'Papua Barat'
-                ]
-            }
-        }
-        
         # Get presets for current country
-        if self.current_country not in presets:
+        if self.current_country not in _COUNTRY_REGION_PRESETS:
             raise ValueError(
                 f"❌ No presets defined for {self.current_country}\n"
-                f"   Available countries: {list(presets.keys())}"
+                f"   Available countries: {list(_COUNTRY_REGION_PRESETS.keys())}"
             )
         
-        country_presets = presets[self.current_country]
+        country_presets = _COUNTRY_REGION_PRESETS[self.current_country]
         
         if preset_name not in country_presets:
             raise ValueError(
@@ -450,7 +641,7 @@ class NaturalEarthLoader:
             )
         
         province_list = country_presets[preset_name]
-        print(f"📍 Loading preset region: {preset_name} ({len(province_list)} provinces)")
+        logger.debug("📍 Loading preset region: %s (%d provinces)", preset_name, len(province_list))
         
         return self.get_provinces_by_name(province_list)
 
@@ -479,57 +670,82 @@ class OoklaLoader:
                 If None, automatically detects based on project structure.
         """
         if data_dir is None:
-            # Auto-detect project root
-            if '__file__' in globals():
-                current_file = Path(__file__).resolve()
-                project_root = current_file.parent.parent
-            else:
-                project_root = Path.cwd().resolve().parent
-            
-            self.data_dir = project_root / 'data' / 'raw' / 'ookla'
+            # _PROJECT_ROOT is already resolved; joining literal segments keeps it absolute
+            self.data_dir = _PROJECT_ROOT / 'data' / 'raw' / 'ookla'
         else:
-            self.data_dir = Path(data_dir)
+            # Ensure absolute path (user input may be relative or contain '..')
+            self.data_dir = Path(data_dir).resolve()
         
-        # Ensure absolute path
-        self.data_dir = self.data_dir.resolve()
-        
-        print(f"📁 OoklaLoader initialized")
-        print(f"   Data directory: {self.data_dir}")
-        print(f"   Directory exists: {self.data_dir.exists()}")
+        logger.debug("📁 OoklaLoader initialized")
+        logger.debug("   Data directory: %s", self.data_dir)
     
-    def load_processed_data(self, filename=None):
+    def load_processed_data(self, filename=None, columns=None, bbox=None, quarter=None):
         """
         Load previously downloaded Ookla data
         
+        Column selection and the quarter filter are pushed down to the parquet
+        reader, so unused column chunks and non-matching row groups are skipped.
+        
         Parameters:
             filename (str, optional): Specific file to load. If None, loads most recent file.
+            columns (list of str, optional): Columns to load. If None, loads all columns.
+                'geometry' is always included.
+            bbox (tuple, optional): (min_x, min_y, max_x, max_y) to clip tiles to
+            quarter (int, optional): Only load rows for this quarter (1-4)
         
         Returns:
             GeoDataFrame: Ookla data
+            
+        Example:
+            >>> loader = OoklaLoader()
+            >>> data = loader.load_processed_data(columns=['quadkey', 'avg_d_mbps'], quarter=4)
         """
         processed_dir = self.data_dir.parent / 'processed'
         
         if filename:
             file_path = processed_dir / filename
         else:
-            # Find most recent file
-            files = list(processed_dir.glob('*_ookla_*.geoparquet'))
-            if not files:
+            # Find most recent file (DirEntry caches stat results)
+            latest = None
+            try:
+                with os.scandir(processed_dir) as entries:
+                    latest = max(
+                        (e for e in entries
+                         if '_ookla_' in e.name and e.name.endswith('.geoparquet')),
+                        key=lambda e: e.stat().st_mtime,
+                        default=None
+                    )
+            except FileNotFoundError:
+                pass
+            if latest is None:
                 raise FileNotFoundError(
                     f"No Ookla data files found in {processed_dir}\n"
                     f"Run: python scripts/download_ookla.py"
                 )
-            file_path = max(files, key=lambda p: p.stat().st_mtime)
+            file_path = Path(latest.path)
+        
+        if columns is not None and 'geometry' not in columns:
+            columns = list(columns) + ['geometry']
+        
+        filters = None
+        if quarter is not None:
+            filters = [('quarter', '=', quarter)]
+        
+        logger.info("📂 Loading Ookla data from: %s", file_path.name)
+        data = gpd.read_parquet(file_path, columns=columns, filters=filters)
+        
+        if bbox is not None:
+            min_x, min_y, max_x, max_y = bbox
+            data = data.cx[min_x:max_x, min_y:max_y]
         
-        print(f"📂 Loading Ookla data from: {file_path.name}")
-        data = gpd.read_parquet(file_path)
-        print(f"✅ Loaded {len(data):,} records")
+        logger.info("✅ Loaded %d records", len(data))
         
         return data
 
 
 if __name__ == "__main__":
     # Test the loader when run directly
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     print("Testing NaturalEarthLoader...")
     print("=" * 60)
     
@@ -13,10 +13,299 @@ Usage:
     python src/download_natural_earth.py
 """
 
-import subprocess
+import hashlib
+import json
+import os
+import shutil
+import threading
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
+try:
+    # Optional: lets the zip be extracted while it downloads
+    from stream_unzip import stream_unzip
+except ImportError:
+    stream_unzip = None
+
+try:
+    # Optional: progress bar while downloading
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+CHUNK_SIZE = 1 << 16  # 64 KiB
+DOWNLOAD_TIMEOUT = 300  # Seconds without data before a download is abandoned
+
+# Expected SHA-256 of natural_earth_vector.zip. Set it to pin a known
+# release; None only records the hash of what was downloaded
+NATURAL_EARTH_SHA256 = None
+
+# Shapefiles the analysis needs: (subdirectory, filename, description)
+REQUIRED_FILES = [
+    ('10m_cultural', 'ne_10m_admin_0_countries.shp', 'Country Boundaries'),
+    ('10m_cultural', 'ne_10m_admin_1_states_provinces.shp', 'Province/State Boundaries'),
+    ('10m_physical', 'ne_10m_coastline.shp', 'Coastlines'),
+]
+
+
+def _read_download_metadata(meta_file):
+    """Read the {etag, last_modified} sidecar; empty dict if missing or unreadable"""
+    try:
+        with open(meta_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_download_metadata(meta_file, headers, sha256=None):
+    """Store ETag/Last-Modified from response headers (atomic write)"""
+    metadata = {
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+    }
+    if sha256:
+        metadata['sha256'] = sha256
+    tmp = meta_file.with_name(meta_file.name + '.part')
+    with open(tmp, 'w') as f:
+        json.dump(metadata, f)
+    os.replace(tmp, meta_file)
+
+
+def _is_up_to_date(url, meta_file):
+    """
+    Check with a HEAD request whether the upstream file changed
+    
+    Compares ETag (or Last-Modified) against the sidecar written after a
+    complete, verified download. Without a sidecar there is no proof the
+    local data came from a finished download, so it counts as stale. If the
+    server cannot be reached, existing data is kept.
+    
+    Args:
+        url (str): Download URL
+        meta_file (Path): Sidecar with stored validators
+        
+    Returns:
+        bool: True if no re-download is needed
+    """
+    metadata = _read_download_metadata(meta_file)
+    if not metadata:
+        return False
+    
+    try:
+        request = urllib.request.Request(url, method='HEAD')
+        with urllib.request.urlopen(request, timeout=30) as response:
+            headers = response.headers
+    except OSError as e:
+        print(f"   ⚠️  Could not check for updates: {e}")
+        return True
+    
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    if etag and metadata.get('etag'):
+        return etag == metadata['etag']
+    if last_modified and metadata.get('last_modified'):
+        return last_modified == metadata['last_modified']
+    return True
+
+
+def _iter_response_chunks(response, hasher):
+    """
+    Yield the body of an HTTP response in chunks, reporting progress
+    
+    Uses a tqdm progress bar when available, otherwise prints every 10%
+    when the server sends Content-Length. Every chunk is fed to hasher,
+    and a body shorter than Content-Length raises instead of ending quietly.
+    
+    Args:
+        response: Open response from urllib.request.urlopen
+        hasher: hashlib object updated with the body
+        
+    Yields:
+        bytes: Raw body chunks
+    """
+    total_size = int(response.headers.get('Content-Length') or 0)
+    bar = None
+    if tqdm is not None:
+        bar = tqdm(total=total_size or None, unit='B', unit_scale=True, unit_divisor=1024)
+    elif total_size:
+        print(f"   Size: {total_size / (1024 * 1024):.0f} MB")
+    
+    downloaded = 0
+    next_report = 10
+    try:
+        for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+            downloaded += len(chunk)
+            if bar is not None:
+                bar.update(len(chunk))
+            elif total_size and downloaded * 100 >= next_report * total_size:
+                print(f"   {downloaded * 100 // total_size:3d}%")
+                next_report = downloaded * 100 // total_size // 10 * 10 + 10
+            yield chunk
+    finally:
+        if bar is not None:
+            bar.close()
+    
+    if total_size and downloaded != total_size:
+        raise IOError(f"Incomplete download: {downloaded} of {total_size} bytes")
+
+
+def _verify_sha256(sha256):
+    """
+    Compare a download's hash with NATURAL_EARTH_SHA256 (if pinned)
+    
+    Args:
+        sha256 (str): Hex digest of the downloaded zip
+        
+    Raises:
+        ValueError: If the hashes differ
+    """
+    if NATURAL_EARTH_SHA256 and sha256 != NATURAL_EARTH_SHA256.lower():
+        raise ValueError(
+            f"Checksum mismatch: expected {NATURAL_EARTH_SHA256}, got {sha256}"
+        )
+
+
+def _member_path(ne_dir, member_name):
+    """
+    Resolve a zip member name under ne_dir, rejecting paths that escape it
+    
+    Args:
+        ne_dir (Path): Extraction root
+        member_name (str): Name of the zip member
+        
+    Returns:
+        Path: Destination path for the member
+    """
+    target = (ne_dir / member_name).resolve()
+    try:
+        target.relative_to(ne_dir.resolve())
+    except ValueError:
+        raise ValueError(f"Unsafe path in archive: {member_name}")
+    return target
+
+
+def _stream_download_and_extract(url, ne_dir):
+    """
+    Download the Natural Earth zip and extract members as bytes arrive
+    
+    Args:
+        url (str): Zip download URL
+        ne_dir (Path): Extraction root
+        
+    Returns:
+        tuple: (response headers, SHA-256 hex digest of the zip)
+    """
+    hasher = hashlib.sha256()
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        chunks = _iter_response_chunks(response, hasher)
+        for name, _size, unzipped_chunks in stream_unzip(chunks):
+            try:
+                member_name = name.decode('utf-8')
+            except UnicodeDecodeError:
+                member_name = name.decode('cp437')
+            target = _member_path(ne_dir, member_name)
+            
+            if member_name.endswith('/'):
+                target.mkdir(parents=True, exist_ok=True)
+                for _ in unzipped_chunks:
+                    pass
+                continue
+            
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, 'wb') as f:
+                for chunk in unzipped_chunks:
+                    f.write(chunk)
+        
+        # stream_unzip can stop before the end of the body; read the rest so
+        # the hash covers the whole zip and the length check runs
+        for _ in chunks:
+            pass
+        return response.headers, hasher.hexdigest()
+
+
+def _download_zip(url, zip_file):
+    """
+    Download the Natural Earth zip to disk
+    
+    Args:
+        url (str): Zip download URL
+        zip_file (Path): Destination file
+        
+    Returns:
+        tuple: (response headers, SHA-256 hex digest of the zip)
+    """
+    hasher = hashlib.sha256()
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response, \
+            open(zip_file, 'wb') as f:
+        for chunk in _iter_response_chunks(response, hasher):
+            f.write(chunk)
+        return response.headers, hasher.hexdigest()
+
+
+def _extract_zip(zip_file, ne_dir):
+    """
+    Extract a downloaded Natural Earth zip using a thread pool
+    
+    ZipFile handles are not safe to share between threads, so each worker
+    opens its own (one file descriptor per thread). zlib releases the GIL
+    while inflating, so members decompress in parallel.
+    
+    Args:
+        zip_file (Path): Downloaded zip
+        ne_dir (Path): Extraction root
+    """
+    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        members = zip_ref.namelist()
+    
+    # Create directories up front so workers never race on mkdir
+    for name in members:
+        target = _member_path(ne_dir, name)
+        (target if name.endswith('/') else target.parent).mkdir(parents=True, exist_ok=True)
+    
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+    
+    def extract_member(name):
+        if not hasattr(local, 'zip_ref'):
+            local.zip_ref = zipfile.ZipFile(zip_file, 'r')
+            with handles_lock:
+                handles.append(local.zip_ref)
+        local.zip_ref.extract(name, ne_dir)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # list() re-raises the first extraction error, if any
+            list(executor.map(extract_member, [n for n in members if not n.endswith('/')]))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def _replace_dir(src_dir, dest_dir):
+    """
+    Move a freshly extracted directory into place, replacing dest_dir
+    
+    The old tree is renamed aside first, so dest_dir is only ever missing
+    for the moment between two renames; it is deleted once the swap is done.
+    
+    Args:
+        src_dir (Path): Fully extracted and verified directory
+        dest_dir (Path): Final location
+    """
+    old_dir = dest_dir.with_name(dest_dir.name + '.old')
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    if dest_dir.exists():
+        os.replace(dest_dir, old_dir)
+    os.replace(src_dir, dest_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
 def download_natural_earth(force_redownload=False):
     """
     Download and extract Natural Earth vector data.
@@ -25,6 +314,9 @@ def download_natural_earth(force_redownload=False):
     country boundaries, province/state boundaries, and other geographic features
     at multiple scales (10m, 50m, 110m).
     
+    Existing data is only re-downloaded when the upstream zip changed
+    (checked with a HEAD request against the stored ETag/Last-Modified).
+    
     Args:
         force_redownload (bool): If True, re-download even if data exists
         
@@ -44,14 +336,20 @@ def download_natural_earth(force_redownload=False):
     data_dir.mkdir(parents=True, exist_ok=True)
     
     ne_dir = data_dir / 'natural_earth'
+    tmp_dir = data_dir / 'natural_earth.part'
     zip_file = data_dir / 'natural_earth_vector.zip'
+    meta_file = data_dir / 'natural_earth_vector.zip.meta.json'
+    url = "https://naciscdn.org/naturalearth/packages/natural_earth_vector.zip"
     
     print("=" * 70)
     print("Natural Earth Vector Data Download")
     print("=" * 70)
     
-    # Check if already downloaded
-    if not force_redownload and ne_dir.exists() and any(ne_dir.rglob('*.shp')):
+    # Check if already downloaded (and unchanged upstream)
+    have_required = all((ne_dir / subdir / filename).exists()
+                        for subdir, filename, _ in REQUIRED_FILES)
+    if (not force_redownload and have_required
+            and _is_up_to_date(url, meta_file)):
         print(f"\n✅ Natural Earth data already exists at:")
         print(f"   {ne_dir}")
         
@@ -68,103 +366,52 @@ def download_natural_earth(force_redownload=False):
     print(f"   Destination: {data_dir}")
     print("\n   This is a one-time download. Data works for ALL geographic regions.")
     
-    ne_dir.mkdir(parents=True, exist_ok=True)
-    
-    url = "https://naciscdn.org/naturalearth/packages/natural_earth_vector.zip"
-    
-    # Try multiple download methods
-    download_success = False
-    
-    # Method 1: curl (usually available on macOS/Linux)
-    if not download_success:
-        try:
-            print("\n   Trying curl...")
-            subprocess.run(
-                ['curl', '-L', '-o', str(zip_file), url],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            download_success = True
-            print("   ✅ Download successful (curl)")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-    
-    # Method 2: wget (fallback)
-    if not download_success:
-        try:
-            print("   Trying wget...")
-            subprocess.run(
-                ['wget', '-O', str(zip_file), url],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            download_success = True
-            print("   ✅ Download successful (wget)")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-    
-    # Method 3: Python urllib (last resort, works everywhere)
-    if not download_success:
-        try:
-            print("   Trying Python downloader...")
-            import urllib.request
-            urllib.request.urlretrieve(url, str(zip_file))
-            download_success = True
-            print("   ✅ Download successful (Python)")
-        except Exception as e:
-            print(f"   ❌ Download failed: {e}")
-            return False
-    
-    if not download_success:
-        print("\n❌ Failed to download Natural Earth data")
-        print("   Please check your internet connection and try again")
-        return False
+    # Extract into a sibling directory and only move it over ne_dir once the
+    # download is complete and verified, so a failed or tampered download
+    # never replaces (or mixes into) existing data
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
     
-    print("\n📦 Extracting data...")
-    
-    # Try to extract
+    # Stream-decompress while downloading: no temporary zip on disk, and
+    # extraction overlaps with network transfer
     try:
-        # Method 1: unzip (macOS/Linux)
-        try:
-            subprocess.run(
-                ['unzip', '-q', '-o', str(zip_file), '-d', str(ne_dir)],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            print("   ✅ Extraction successful (unzip)")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Method 2: Python zipfile (works everywhere)
-            import zipfile
-            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                zip_ref.extractall(ne_dir)
-            print("   ✅ Extraction successful (Python zipfile)")
+        if stream_unzip is not None:
+            print("\n   Downloading and extracting (streaming)...")
+            headers, sha256 = _stream_download_and_extract(url, tmp_dir)
+            _verify_sha256(sha256)
+            print("   ✅ Download and extraction successful")
+        else:
+            # stream-unzip not installed: download the zip, then extract it
+            print("\n   Downloading...")
+            headers, sha256 = _download_zip(url, zip_file)
+            _verify_sha256(sha256)  # Before anything is extracted
+            print("   ✅ Download successful")
+            print("\n📦 Extracting data...")
+            _extract_zip(zip_file, tmp_dir)
+            print("   ✅ Extraction successful")
+        _replace_dir(tmp_dir, ne_dir)
+        _write_download_metadata(meta_file, headers, sha256)
     except Exception as e:
-        print(f"   ❌ Extraction failed: {e}")
+        print(f"   ❌ Download failed: {e}")
+        print("   Please check your internet connection and try again")
         return False
-    
-    # Clean up zip file
-    try:
-        zip_file.unlink()
-        print("   🗑️  Cleaned up zip file")
-    except:
-        pass
+    finally:
+        # Clean up zip file (only left by the non-streaming path)
+        if zip_file.exists():
+            zip_file.unlink()
+            print("   🗑️  Cleaned up zip file")
+        # Left behind only if the download or verification failed
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
     
     print("\n" + "=" * 70)
     print("✅ Verification")
     print("=" * 70)
     
     # Verify key files exist
-    required_files = [
-        ('10m_cultural', 'ne_10m_admin_0_countries.shp', 'Country Boundaries'),
-        ('10m_cultural', 'ne_10m_admin_1_states_provinces.shp', 'Province/State Boundaries'),
-        ('10m_physical', 'ne_10m_coastline.shp', 'Coastlines'),
-    ]
-    
     all_exist = True
-    for subdir, filename, description in required_files:
+    for subdir, filename, description in REQUIRED_FILES:
         file_path = ne_dir / subdir / filename
         if file_path.exists():
             print(f"   ✅ {description:30} - Found")
@@ -3,14 +3,134 @@ Ookla Data Downloader
 Downloads and filters Ookla connectivity data for any specified region
 """
 
+import hashlib
+import io
+import json
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import geopandas as gpd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import shapely
 from pathlib import Path
 from datetime import datetime
-from src.config import OOKLA_CONFIG, OOKLA_DIR
+from src.config import OOKLA_CONFIG, OOKLA_DIR, CACHE_DIR
 from src.data_loader import NaturalEarthLoader
 
 
+# Ookla tiles are axis-aligned rectangles written as
+# POLYGON((x1 y1, x2 y1, x2 y2, x1 y2, x1 y1)); the first and third
+# vertices are opposite corners
+_NUM = r'-?[\d.]+(?:[eE][-+]?\d+)?'
+_TILE_CORNERS_RE = (
+    rf'^\s*POLYGON\s*\(\(\s*(?P<x1>{_NUM})\s+(?P<y1>{_NUM})\s*,'
+    rf'\s*{_NUM}\s+{_NUM}\s*,\s*(?P<x2>{_NUM})\s+(?P<y2>{_NUM})'
+)
+
+
+def _tile_bounds(tiles):
+    """
+    Get tile bounding boxes straight from the WKT text
+    
+    Parameters:
+        tiles (pyarrow.Array): Ookla tile WKT strings
+    
+    Returns:
+        tuple: (min_x, min_y, max_x, max_y) float arrays; NaN where the
+               WKT does not have the expected rectangle layout
+    """
+    corners = pc.extract_regex(tiles, _TILE_CORNERS_RE)
+    x1, y1, x2, y2 = (
+        pc.cast(pc.struct_field(corners, key), pa.float64())
+        .to_numpy(zero_copy_only=False)
+        for key in ('x1', 'y1', 'x2', 'y2')
+    )
+    return (
+        np.fmin(x1, x2), np.fmin(y1, y2),
+        np.fmax(x1, x2), np.fmax(y1, y2)
+    )
+
+
+# Rows per record batch when scanning a quarter's parquet files
+SCAN_BATCH_SIZE = 100_000
+
+# Rows per row group in the saved regional files
+PARQUET_ROW_GROUP_SIZE = 262_144
+
+# Below this many tiles a single from_wkt call beats splitting across threads
+WKT_PARALLEL_MIN_SIZE = 200_000
+
+
+def _parse_wkt(wkt):
+    """
+    Parse WKT strings into geometries, spread across CPU cores
+    
+    GEOS releases the GIL inside shapely's vectorized calls, so chunks
+    parsed on separate threads run truly in parallel.
+    
+    Parameters:
+        wkt (ndarray): WKT strings
+    
+    Returns:
+        ndarray: Shapely geometries
+    """
+    n_chunks = min(os.cpu_count() or 1, len(wkt) // WKT_PARALLEL_MIN_SIZE)
+    if n_chunks <= 1:
+        return shapely.from_wkt(wkt)
+    with ThreadPoolExecutor(max_workers=n_chunks) as executor:
+        parts = list(executor.map(shapely.from_wkt, np.array_split(wkt, n_chunks)))
+    return np.concatenate(parts)
+
+
+def _narrow_dtypes(gdf):
+    """
+    Downcast result columns in place before saving
+    
+    Ookla counters (kbps, ms, tests, devices) fit in int32, Mbps values
+    need no more than float32, and the metadata strings repeat on every
+    row, so they are stored as categoricals (dictionary-encoded in parquet).
+    
+    Parameters:
+        gdf (GeoDataFrame): Filtered Ookla data
+    """
+    for col in ('avg_d_kbps', 'avg_u_kbps', 'avg_lat_ms', 'tests', 'devices'):
+        if col in gdf.columns and pd.api.types.is_integer_dtype(gdf[col]):
+            gdf[col] = gdf[col].astype('int32')
+    for col in ('avg_d_mbps', 'avg_u_mbps'):
+        if col in gdf.columns:
+            gdf[col] = gdf[col].astype('float32')
+    gdf['year'] = gdf['year'].astype('int16')
+    gdf['quarter'] = gdf['quarter'].astype('int8')
+    for col in ('name', 'region', 'country', 'data_type'):
+        if col in gdf.columns:
+            gdf[col] = gdf[col].astype('category')
+
+
+def _open_dataset(uri):
+    """
+    Open a directory of parquet files as a pyarrow dataset
+    
+    Parameters:
+        uri (str): s3:// URI (read anonymously) or any URI pyarrow understands
+    
+    Returns:
+        pyarrow.dataset.Dataset: Lazily-read dataset
+    """
+    if uri.startswith('s3://'):
+        filesystem = pafs.S3FileSystem(
+            anonymous=True, region=OOKLA_CONFIG['s3_region']
+        )
+        path = uri[len('s3://'):]
+    else:
+        filesystem, path = pafs.FileSystem.from_uri(uri)
+    return ds.dataset(path.rstrip('/'), filesystem=filesystem, format='parquet')
+
+
 class OoklaDownloader:
     """
     Download Ookla connectivity data for specified regions and time periods
@@ -57,12 +177,21 @@ class OoklaDownloader:
                 "Must provide either region_key OR (country + provinces)"
             )
         
-        # Load geographic boundaries
+        # Load geographic boundaries (from the cache when the same
+        # country/provinces were resolved before)
         print(f"\n🌍 Loading geographic boundaries...")
-        self.geo_loader.set_country(self.region_info['country'])
-        self.boundaries = self.geo_loader.get_provinces_by_name(
-            self.region_info['provinces']
-        )
+        cache_file = self._boundaries_cache_file()
+        if self._is_cache_fresh(cache_file):
+            self.boundaries = gpd.read_parquet(cache_file)
+        else:
+            self.geo_loader.set_country(self.region_info['country'])
+            self.boundaries = self.geo_loader.get_provinces_by_name(
+                self.region_info['provinces']
+            )
+            if len(self.boundaries) > 0:
+                tmp_file = cache_file.with_name(cache_file.name + '.part')
+                self.boundaries.to_parquet(tmp_file, index=False)
+                os.replace(tmp_file, cache_file)
         
         print(f"✅ Region configured: {self.region_info['name']}")
         print(f"   Country: {self.region_info['country']}")
@@ -70,6 +199,25 @@ class OoklaDownloader:
         
         return self
     
+    def _boundaries_cache_file(self):
+        """Cache path for the current region's boundaries"""
+        country = self.region_info['country']
+        key = json.dumps([country, sorted(self.region_info['provinces'])])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        slug = country.lower().replace(' ', '_')
+        return CACHE_DIR / f"{slug}_{digest}.parquet"
+    
+    def _is_cache_fresh(self, cache_file):
+        """Check the cache exists and is newer than the provinces shapefile"""
+        if not cache_file.exists():
+            return False
+        source = self.geo_loader.data_dir / '10m_cultural' / 'ne_10m_admin_1_states_provinces.shp'
+        try:
+            return cache_file.stat().st_mtime >= source.stat().st_mtime
+        except OSError:
+            # Shapefile gone but the cached selection is still usable
+            return True
+    
     def download(self, year, quarter, data_type='mobile', columns=None):
         """
         Download Ookla data for specified parameters
@@ -86,6 +234,17 @@ class OoklaDownloader:
         Example:
             >>> data = downloader.download(2024, 4, 'mobile')
         """
+        self._validate_request(year, quarter, data_type)
+        
+        if columns is None:
+            columns = OOKLA_CONFIG['default_columns']
+        
+        return self._download_one(
+            self.boundaries, self.region_info, year, quarter, data_type, columns
+        )
+    
+    def _validate_request(self, year, quarter, data_type):
+        """Check that a region is set and the period/type are available"""
         if self.region_info is None:
             raise ValueError("❌ Region not set! Call set_region() first.")
         
@@ -97,17 +256,35 @@ class OoklaDownloader:
             raise ValueError(
                 f"data_type must be one of {OOKLA_CONFIG['data_types']}"
             )
+    
+    def _download_one(self, boundaries, region_info, year, quarter, data_type, columns, log=print):
+        """
+        Download and filter one quarter/data type
         
-        if columns is None:
-            columns = OOKLA_CONFIG['default_columns']
+        Only touches the arguments it is given (never self.region_info or
+        self.boundaries), so several calls can run in parallel threads.
+        Progress goes through log, so parallel jobs can keep their output
+        apart instead of interleaving on stdout.
         
-        print(f"\n{'='*70}")
-        print(f"DOWNLOADING OOKLA DATA")
-        print(f"{'='*70}")
-        print(f"Region:   {self.region_info['name']}")
-        print(f"Period:   {year} Q{quarter}")
-        print(f"Type:     {data_type}")
-        print(f"{'='*70}\n")
+        Parameters:
+            boundaries (GeoDataFrame): Province boundaries with a 'name' column
+            region_info (dict): Region name, country and provinces
+            year (int): Year
+            quarter (int): Quarter
+            data_type (str): 'mobile' or 'fixed'
+            columns (list): Columns to extract
+            log (callable): print-compatible function for progress messages
+        
+        Returns:
+            GeoDataFrame: Filtered Ookla data, or None
+        """
+        log(f"\n{'='*70}")
+        log(f"DOWNLOADING OOKLA DATA")
+        log(f"{'='*70}")
+        log(f"Region:   {region_info['name']}")
+        log(f"Period:   {year} Q{quarter}")
+        log(f"Type:     {data_type}")
+        log(f"{'='*70}\n")
         
         # Construct S3 URI
         s3_uri = (
@@ -115,93 +292,149 @@ class OoklaDownloader:
             f"type={data_type}/year={year}/quarter={quarter}/"
         )
         
-        print(f"📥 Downloading from S3...")
-        print(f"   {s3_uri}")
+        log(f"📥 Downloading from S3...")
+        log(f"   {s3_uri}")
         
         try:
-            # Read from S3
-            storage_options = {"anon": True}
-            df = pd.read_parquet(s3_uri, storage_options=storage_options)
-            print(f"   ✅ Downloaded {len(df):,} global tiles")
+            bounds = boundaries.total_bounds
+            min_x, min_y, max_x, max_y = bounds
             
-            # Convert to GeoDataFrame
-            print(f"\n🗺️  Converting to geographic data...")
-            gdf = gpd.GeoDataFrame(
-                df,
-                geometry=gpd.GeoSeries.from_wkt(df['tile']),
-                crs="EPSG:4326"
-            )
+            # Read from S3, fetching only the columns needed downstream.
+            # Newer releases carry tile centroid columns, which lets Arrow
+            # skip row groups outside the region using parquet statistics
+            dataset = _open_dataset(s3_uri)
+            schema_cols = dataset.schema.names
+            read_cols = [c for c in dict.fromkeys(columns + ['tile']) if c in schema_cols]
+            row_filter = None
+            if 'tile_x' in schema_cols and 'tile_y' in schema_cols:
+                pad = OOKLA_CONFIG['tile_size_deg']
+                row_filter = (
+                    (ds.field('tile_x') >= min_x - pad) & (ds.field('tile_x') <= max_x + pad) &
+                    (ds.field('tile_y') >= min_y - pad) & (ds.field('tile_y') <= max_y + pad)
+                )
             
-            # Filter to region using bounding box first (fast)
-            print(f"\n🎯 Filtering to region boundaries...")
-            bounds = self.boundaries.total_bounds
-            min_x, min_y, max_x, max_y = bounds
+            # Filter to region using bounding box first (fast), one record
+            # batch at a time so only the surviving tiles are ever held in
+            # memory. Tile extents come from the WKT text, so only tiles
+            # inside the box are ever parsed into geometries
+            kept_batches = []
+            kept_bounds = []
+            n_tiles = 0
+            for batch in dataset.to_batches(
+                columns=read_cols, filter=row_filter, batch_size=SCAN_BATCH_SIZE
+            ):
+                n_tiles += batch.num_rows
+                batch_bounds = _tile_bounds(batch.column('tile'))
+                tile_min_x, tile_min_y, tile_max_x, tile_max_y = batch_bounds
+                outside = (
+                    (tile_max_x < min_x) | (tile_min_x > max_x) |
+                    (tile_max_y < min_y) | (tile_min_y > max_y)
+                )
+                in_bbox = ~outside
+                if in_bbox.any():
+                    kept_batches.append(batch.filter(pa.array(in_bbox)))
+                    kept_bounds.append([b[in_bbox] for b in batch_bounds])
+            log(f"   ✅ Downloaded {n_tiles:,} tiles")
             
-            gdf_bbox = gdf.cx[min_x:max_x, min_y:max_y]
-            print(f"   Bounding box filter: {len(gdf_bbox):,} tiles")
+            log(f"\n🎯 Filtering to region boundaries...")
+            n_bbox = sum(batch.num_rows for batch in kept_batches)
+            log(f"   Bounding box filter: {n_bbox:,} tiles")
             
-            if len(gdf_bbox) == 0:
-                print(f"   ⚠️  No data found in region bounding box")
+            if n_bbox == 0:
+                log(f"   ⚠️  No data found in region bounding box")
                 return None
             
-            # Precise spatial join (slower but accurate)
-            print(f"   Performing precise spatial join...")
-            gdf_filtered = gpd.sjoin(
-                gdf_bbox,
-                self.boundaries[['geometry', 'name']],
-                how='inner',
-                predicate='intersects'
+            df_bbox = pa.Table.from_batches(kept_batches).to_pandas()
+            tile_min_x, tile_min_y, tile_max_x, tile_max_y = (
+                np.concatenate(parts) for parts in zip(*kept_bounds)
             )
             
-            print(f"   ✅ Filtered to {len(gdf_filtered):,} tiles in region")
+            # Precise point-in-polygon test on tile centroids. Tiles are tiny
+            # next to provinces, so the centroid decides which province a
+            # tile belongs to and no tile polygons are needed for the test
+            log(f"   Matching tile centroids to provinces...")
+            centroid_x = (tile_min_x + tile_max_x) / 2
+            centroid_y = (tile_min_y + tile_max_y) / 2
+            unparsed = np.isnan(centroid_x) | np.isnan(centroid_y)
+            centroids = shapely.points(
+                np.where(unparsed, 0.0, centroid_x),
+                np.where(unparsed, 0.0, centroid_y)
+            )
+            if unparsed.any():
+                centroids[unparsed] = shapely.centroid(
+                    _parse_wkt(df_bbox['tile'].to_numpy()[unparsed])
+                )
             
-            if len(gdf_filtered) == 0:
-                print(f"   ⚠️  No data found in specified provinces")
-                return None
+            tree = shapely.STRtree(boundaries.geometry.values)
+            tile_idx, province_idx = tree.query(centroids, predicate='within')
             
-            # Select requested columns + metadata
-            available_cols = [c for c in columns if c in gdf_filtered.columns]
-            metadata_cols = ['name']  # Province name from spatial join
+            # Select requested columns + metadata (ordered, no duplicates)
+            # and attach the matched tile polygons (one vectorized GEOS call)
+            df_matched = df_bbox.iloc[tile_idx]
+            metadata_cols = ['name']  # Province name from the centroid match
+            available_cols = [
+                c for c in dict.fromkeys(columns)
+                if c in df_matched.columns and c not in metadata_cols
+            ]
+            geoms = _parse_wkt(df_matched['tile'].to_numpy())
+            gdf_result = gpd.GeoDataFrame(
+                df_matched[available_cols],
+                geometry=gpd.GeoSeries(geoms, index=df_matched.index, crs="EPSG:4326")
+            )
+            gdf_result.insert(
+                len(available_cols), 'name', boundaries['name'].to_numpy()[province_idx]
+            )
             
-            final_cols = list(set(available_cols + metadata_cols))
-            gdf_result = gdf_filtered[final_cols].copy()
+            log(f"   ✅ Filtered to {len(gdf_result):,} tiles in region")
+            
+            if len(gdf_result) == 0:
+                log(f"   ⚠️  No data found in specified provinces")
+                return None
             
             # Add metadata
             gdf_result['year'] = year
             gdf_result['quarter'] = quarter
             gdf_result['data_type'] = data_type
-            gdf_result['region'] = self.region_info['name']
-            gdf_result['country'] = self.region_info['country']
+            gdf_result['region'] = region_info['name']
+            gdf_result['country'] = region_info['country']
+            
+            # Convert speeds to Mbps for easier interpretation (computed
+            # straight in float32, the dtype they are saved with)
+            for kbps_col, mbps_col in (('avg_d_kbps', 'avg_d_mbps'), ('avg_u_kbps', 'avg_u_mbps')):
+                if kbps_col in gdf_result.columns:
+                    # to_numpy can return a view of the kbps column, so the
+                    # result goes to a new array rather than out=
+                    kbps = gdf_result[kbps_col].to_numpy(dtype=np.float32)
+                    gdf_result[mbps_col] = kbps / np.float32(1000)
             
-            # Convert speeds to Mbps for easier interpretation
-            if 'avg_d_kbps' in gdf_result.columns:
-                gdf_result['avg_d_mbps'] = gdf_result['avg_d_kbps'] / 1000
-            if 'avg_u_kbps' in gdf_result.columns:
-                gdf_result['avg_u_mbps'] = gdf_result['avg_u_kbps'] / 1000
+            _narrow_dtypes(gdf_result)
             
             # Save to file
-            output_file = self._get_output_filename(year, quarter, data_type)
-            gdf_result.to_parquet(output_file, index=False)
+            output_file = self._get_output_filename(year, quarter, data_type, region_info)
+            gdf_result.to_parquet(
+                output_file, index=False, compression='zstd',
+                compression_level=3, row_group_size=PARQUET_ROW_GROUP_SIZE
+            )
             
-            print(f"\n💾 Saved to: {output_file.name}")
-            print(f"\n📊 Summary Statistics:")
-            print(f"   Total tiles: {len(gdf_result):,}")
-            print(f"   Provinces covered: {gdf_result['name'].nunique()}")
+            log(f"\n💾 Saved to: {output_file.name}")
+            log(f"\n📊 Summary Statistics:")
+            log(f"   Total tiles: {len(gdf_result):,}")
+            log(f"   Provinces covered: {gdf_result['name'].nunique()}")
             if 'avg_d_mbps' in gdf_result.columns:
-                print(f"   Avg download speed: {gdf_result['avg_d_mbps'].mean():.2f} Mbps")
+                log(f"   Avg download speed: {gdf_result['avg_d_mbps'].mean():.2f} Mbps")
             if 'avg_u_mbps' in gdf_result.columns:
-                print(f"   Avg upload speed: {gdf_result['avg_u_mbps'].mean():.2f} Mbps")
+                log(f"   Avg upload speed: {gdf_result['avg_u_mbps'].mean():.2f} Mbps")
             if 'tests' in gdf_result.columns:
-                print(f"   Total tests: {gdf_result['tests'].sum():,}")
+                log(f"   Total tests: {gdf_result['tests'].sum():,}")
             
-            print(f"\n✅ Download complete!")
+            log(f"\n✅ Download complete!")
             
             return gdf_result
             
         except Exception as e:
-            print(f"\n❌ Error downloading data: {e}")
+            log(f"\n❌ Error downloading data: {e}")
             import traceback
-            traceback.print_exc()
+            log(traceback.format_exc(), end='')
             return None
     
     def download_multiple(self, year, quarters, data_types=None):
@@ -222,18 +455,45 @@ class OoklaDownloader:
         if data_types is None:
             data_types = ['mobile', 'fixed']
         
+        jobs = [(quarter, data_type) for quarter in quarters for data_type in data_types]
+        for quarter, data_type in jobs:
+            self._validate_request(year, quarter, data_type)
+        
         results = {}
+        if not jobs:
+            return results
         
-        for quarter in quarters:
-            for data_type in data_types:
+        # Jobs are independent: S3 reads are I/O bound and the heavy
+        # geometry work runs in GEOS, which releases the GIL
+        max_workers = min(OOKLA_CONFIG['max_parallel_downloads'], len(jobs))
+        # Each job logs into its own buffer, printed in one piece when the
+        # job finishes (redirect_stdout is process-wide, so not per thread)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for quarter, data_type in jobs:
                 key = f"{year}_Q{quarter}_{data_type}"
-                print(f"\n{'='*70}")
-                print(f"Downloading: {key}")
-                print(f"{'='*70}")
+                buffer = io.StringIO()
+                log = partial(print, file=buffer)
+                log(f"\n{'='*70}")
+                log(f"Downloading: {key}")
+                log(f"{'='*70}")
                 
-                data = self.download(year, quarter, data_type)
-                if data is not None:
-                    results[key] = data
+                future = executor.submit(
+                    self._download_one, self.boundaries, self.region_info,
+                    year, quarter, data_type, OOKLA_CONFIG['default_columns'], log
+                )
+                futures[future] = (key, buffer)
+            
+            downloaded = {}
+            for future in as_completed(futures):
+                key, buffer = futures[future]
+                print(buffer.getvalue(), end='')
+                downloaded[key] = future.result()
+        
+        # Keep results in request order, not completion order
+        for key, _ in futures.values():
+            if downloaded[key] is not None:
+                results[key] = downloaded[key]
         
         print(f"\n{'='*70}")
         print(f"✅ Downloaded {len(results)} datasets")
@@ -241,9 +501,11 @@ class OoklaDownloader:
         
         return results
     
-    def _get_output_filename(self, year, quarter, data_type):
+    def _get_output_filename(self, year, quarter, data_type, region_info=None):
         """Generate output filename"""
-        region_slug = self.region_info['name'].lower().replace(' ', '_')
+        if region_info is None:
+            region_info = self.region_info
+        region_slug = region_info['name'].lower().replace(' ', '_')
         timestamp = datetime.now().strftime('%Y%m%d')
         filename = f"{region_slug}_{year}_Q{quarter}_{data_type}_{timestamp}.geoparquet"
         return OOKLA_DIR / filename
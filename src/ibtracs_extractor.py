@@ -5,15 +5,368 @@ Dynamic IBTrACS data extraction
 Works for any cyclone defined in config
 """
 
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from pathlib import Path
 import requests
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 
 from config.analysis_config import ANALYSIS_CONFIG
 from src.path_manager import paths
 
+IBTRACS_URL = "https://www.ncei.noaa.gov/data/international-best-track-archive-for-climate-stewardship-ibtracs/v04r01/access/csv/ibtracs.since1980.list.v04r01.csv"
+# Expected SHA-256 of the downloaded CSV. NOAA refreshes the file regularly,
+# so this is off (None) by default; pin it to freeze a known release
+IBTRACS_SHA256 = None
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+PARALLEL_SEGMENTS = 8
+PARALLEL_MIN_SIZE = 16 << 20  # Below this a single stream is fast enough
+
+
+# Saffir-Simpson style thresholds (knots): a wind below _INTENSITY_BINS[i]
+# gets _INTENSITY_LABELS[i]
+_INTENSITY_BINS = np.array([34, 64, 83, 96, 113, 137], dtype=np.float32)
+_INTENSITY_LABELS = np.array([
+    'Tropical Depression', 'Tropical Storm', 'Category 1', 'Category 2',
+    'Category 3', 'Category 4', 'Category 5'
+], dtype=object)
+
+# Typed columns in the Parquet cache; everything else stays text
+_IBTRACS_FLOAT_COLUMNS = ('LAT', 'LON', 'WMO_WIND', 'WMO_PRES')
+# Text accepted by those casts (a SEASON is a 4-digit year, fits int16)
+_FLOAT_PATTERN = r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$'
+_SEASON_PATTERN = r'^\d{4}$'
+
+
+def _open_ibtracs_csv(ibtracs_file):
+    """
+    Open the IBTrACS CSV as a stream of pyarrow record batches
+    
+    Everything is read as text: IBTrACS uses ' ' for missing values, which
+    breaks per-block type inference.
+    """
+    with open(ibtracs_file, newline='') as f:
+        column_names = next(csv.reader(f))
+    
+    return pacsv.open_csv(
+        ibtracs_file,
+        read_options=pacsv.ReadOptions(skip_rows_after_names=1, block_size=16 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in column_names}
+        )
+    )
+
+
+def _blank_to_null(column):
+    """Trim text and turn IBTrACS blanks (' ') into nulls"""
+    trimmed = pc.utf8_trim_whitespace(column)
+    return pc.if_else(pc.equal(trimmed, ''), pa.scalar(None, pa.string()), trimmed)
+
+
+def _text_to_number(column, target_type, pattern):
+    """Cast text to target_type; blanks and values not matching pattern become null"""
+    text = _blank_to_null(column)
+    valid = pc.fill_null(pc.match_substring_regex(text, pattern), False)
+    return pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), target_type)
+
+
+def _typed_ibtracs_batch(batch):
+    """
+    Cast the columns used downstream to compact native types
+    
+    Malformed values become nulls, like pd.to_numeric/pd.to_datetime with
+    errors='coerce', instead of failing the whole conversion.
+    """
+    columns = []
+    for name, column in zip(batch.schema.names, batch.columns):
+        if name in _IBTRACS_FLOAT_COLUMNS:
+            column = _text_to_number(column, pa.float32(), _FLOAT_PATTERN)
+        elif name == 'SEASON':
+            column = _text_to_number(column, pa.int16(), _SEASON_PATTERN)
+        elif name == 'ISO_TIME':
+            column = pc.strptime(_blank_to_null(column), format='%Y-%m-%d %H:%M:%S', unit='s',
+                                 error_is_null=True)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def _coerce_numeric_columns(track):
+    """
+    Give numeric IBTrACS columns (NUMBER, DIST2LAND, USA_SSHS, ...) numeric dtypes
+    
+    The CSV is read as text, so every column the cache does not type is a
+    string column. A text column becomes numeric when all of its non-blank
+    values parse as numbers, which is how pd.read_csv inferred them; blanks
+    become NaN. Other columns keep their text.
+    
+    Parameters:
+        track (DataFrame): Track rows
+    
+    Returns:
+        DataFrame: track with numeric columns converted
+    """
+    for col in track.columns:
+        if not (pd.api.types.is_object_dtype(track[col]) or pd.api.types.is_string_dtype(track[col])):
+            continue
+        text = track[col].str.strip()
+        text = text.where(text != '')
+        numbers = pd.to_numeric(text, errors='coerce')
+        if text.notna().any() and numbers.notna().sum() == text.notna().sum():
+            track[col] = numbers
+    return track
+
+
+def _ensure_ibtracs_parquet(ibtracs_file):
+    """
+    Return a Parquet copy of the IBTrACS CSV, converting it when stale
+    
+    The source file's mtime and size are stored in the Parquet schema
+    metadata; a re-downloaded CSV therefore triggers a fresh conversion.
+    String columns are dictionary-encoded by the Parquet writer, and SEASON
+    row-group statistics let filtered reads skip most of the file.
+    
+    Parameters:
+        ibtracs_file (Path): IBTrACS CSV
+    
+    Returns:
+        Path: Parquet cache next to the CSV
+    """
+    parquet_file = ibtracs_file.with_suffix('.parquet')
+    source_stat = ibtracs_file.stat()
+    source_key = {
+        b'source_mtime_ns': str(source_stat.st_mtime_ns).encode(),
+        b'source_size': str(source_stat.st_size).encode(),
+    }
+    
+    if parquet_file.exists():
+        try:
+            cached_metadata = pq.read_schema(parquet_file).metadata or {}
+        except pa.ArrowInvalid:
+            cached_metadata = {}  # Corrupt cache: rebuild it
+        if all(cached_metadata.get(k) == v for k, v in source_key.items()):
+            return parquet_file
+    
+    print("🗜️  Caching IBTrACS database as Parquet (one-time per download)...")
+    tmp_file = parquet_file.with_suffix('.parquet.part')
+    writer = None
+    try:
+        for batch in _open_ibtracs_csv(ibtracs_file):
+            typed = _typed_ibtracs_batch(batch)
+            if writer is None:
+                schema = typed.schema.with_metadata(source_key)
+                writer = pq.ParquetWriter(tmp_file, schema, compression='zstd')
+            writer.write_batch(typed)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_file, parquet_file)
+    
+    return parquet_file
+
+
+def _read_ibtracs_track(ibtracs_file, name, seasons):
+    """
+    Read only the rows of one storm from IBTrACS
+    
+    Reads the Parquet cache with NAME/SEASON pushed down as filters. If the
+    cache cannot be written, streams the CSV and filters each block instead,
+    so memory holds just the matching rows either way.
+    
+    Parameters:
+        ibtracs_file (Path): IBTrACS CSV (header row followed by a units row)
+        name (str): Storm name (case-insensitive)
+        seasons (list of int): SEASON values to keep
+    
+    Returns:
+        DataFrame: Matching track rows, numeric columns as numbers
+    """
+    try:
+        parquet_file = _ensure_ibtracs_parquet(ibtracs_file)
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"⚠️  Could not cache IBTrACS as Parquet ({e}), reading CSV")
+    else:
+        # IBTrACS storm names are upper case
+        track = pd.read_parquet(
+            parquet_file,
+            filters=[('NAME', '==', name.upper()), ('SEASON', 'in', list(seasons))]
+        )
+        return _coerce_numeric_columns(track)
+    
+    reader = _open_ibtracs_csv(ibtracs_file)
+    name_upper = name.upper()
+    season_values = pa.array([str(season) for season in seasons])
+    matches = []
+    for batch in reader:
+        mask = pc.and_(
+            pc.equal(pc.utf8_upper(batch['NAME']), name_upper),
+            pc.is_in(batch['SEASON'], value_set=season_values)
+        )
+        filtered = batch.filter(mask)
+        if filtered.num_rows:
+            matches.append(filtered)
+    
+    table = pa.Table.from_batches(matches, schema=reader.schema)
+    return _coerce_numeric_columns(table.to_pandas())
+
+
+class _RangeNotSupported(Exception):
+    """Server answered a Range request with the full body"""
+
+
+def _download_ranges_parallel(url, tmp_file, total_size, validator=None):
+    """
+    Download a file as PARALLEL_SEGMENTS concurrent byte ranges
+    
+    The target is pre-sized and every worker writes its segment at its own
+    offset through a separate file handle, so writers never serialize.
+    
+    Parameters:
+        url (str): File URL
+        tmp_file (Path): Destination (overwritten)
+        total_size (int): Content-Length from a HEAD request
+        validator (str, optional): ETag/Last-Modified sent as If-Range so a
+            file changed mid-download is detected
+    
+    Returns:
+        bool: True on success, False if the server ignored the Range header
+    """
+    segment_size = -(-total_size // PARALLEL_SEGMENTS)
+    segments = [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+    
+    with open(tmp_file, 'wb') as f:
+        f.truncate(total_size)
+    
+    def fetch_segment(segment):
+        start, end = segment
+        headers = {'Range': f'bytes={start}-{end}'}
+        if validator:
+            headers['If-Range'] = validator
+        with requests.get(url, headers=headers, stream=True, timeout=300) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise _RangeNotSupported()
+            written = 0
+            with open(tmp_file, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+        if written != end - start + 1:
+            raise IOError(f"Incomplete segment bytes={start}-{end}")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            list(executor.map(fetch_segment, segments))
+    except _RangeNotSupported:
+        return False
+    return True
+
+
+def _hash_file(hasher, path):
+    """Feed an existing file into a hashlib object"""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher
+
+
+def _verify_download(tmp_file, tmp_meta_file, sha256):
+    """
+    Check a finished download against IBTRACS_SHA256 and record its hash
+    
+    On a mismatch the partial file is removed so it is never resumed.
+    
+    Parameters:
+        tmp_file (Path): Downloaded .part file
+        tmp_meta_file (Path): Its sidecar
+        sha256 (str): Hex digest of tmp_file
+    """
+    if IBTRACS_SHA256 and sha256 != IBTRACS_SHA256.lower():
+        tmp_file.unlink(missing_ok=True)
+        tmp_meta_file.unlink(missing_ok=True)
+        raise ValueError(
+            f"Checksum mismatch: expected {IBTRACS_SHA256}, got {sha256}"
+        )
+    metadata = _read_download_metadata(tmp_meta_file)
+    metadata['sha256'] = sha256
+    _write_metadata_file(tmp_meta_file, metadata)
+
+
+def _read_download_metadata(meta_file):
+    """Read the {etag, last_modified} sidecar; empty dict if missing or unreadable"""
+    try:
+        with open(meta_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_download_metadata(meta_file, headers):
+    """Store ETag/Last-Modified from response headers (atomic write)"""
+    _write_metadata_file(meta_file, {
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+    })
+
+
+def _write_metadata_file(meta_file, metadata):
+    """Write a sidecar dict via a temporary file and rename"""
+    tmp = meta_file.with_name(meta_file.name + '.part')
+    with open(tmp, 'w') as f:
+        json.dump(metadata, f)
+    os.replace(tmp, meta_file)
+
+
+def _is_up_to_date(headers, metadata, local_file):
+    """
+    Compare upstream validators against what was stored at download time
+    
+    Without a sidecar (file downloaded before it was tracked), the local
+    file counts as current if it is newer than the upstream Last-Modified.
+    """
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    
+    if metadata:
+        if etag and metadata.get('etag'):
+            return etag == metadata['etag']
+        if last_modified and metadata.get('last_modified'):
+            return last_modified == metadata['last_modified']
+        return True
+    
+    if last_modified:
+        try:
+            remote_time = parsedate_to_datetime(last_modified).timestamp()
+        except (TypeError, ValueError):
+            return True
+        return local_file.stat().st_mtime >= remote_time
+    return True
+
+
+def _conditional_headers(metadata):
+    """Build If-None-Match / If-Modified-Since request headers"""
+    headers = {}
+    if metadata.get('etag'):
+        headers['If-None-Match'] = metadata['etag']
+    if metadata.get('last_modified'):
+        headers['If-Modified-Since'] = metadata['last_modified']
+    return headers
+
 class IBTracsExtractor:
     """
     Extract cyclone track from IBTrACS
@@ -26,31 +379,138 @@ class IBTracsExtractor:
         self.cyclone_id = self.config['computed']['cyclone_id']
         
     def download_ibtracs_database(self):
-        """Download IBTrACS database if not present"""
+        """
+        Download IBTrACS database if not present or updated upstream
+        
+        An existing file is kept unless NOAA's ETag/Last-Modified changed
+        since it was downloaded (stored in a .meta.json sidecar).
+        
+        Downloads go to a .csv.part file that is renamed into place on
+        completion. Large files are fetched as parallel byte ranges when the
+        server supports them. An interrupted single-stream download is resumed
+        with an HTTP Range request; If-Range makes the server send the whole
+        file instead if it changed in the meantime.
+        """
         
         ibtracs_file = paths.ibtracs_raw / 'IBTrACS.since1980.list.v04r01.csv'
+        meta_file = ibtracs_file.with_name(ibtracs_file.name + '.meta.json')
+        url = IBTRACS_URL
         
+        metadata = {}
+        head = None
         if ibtracs_file.exists():
-            print(f"✅ IBTrACS database already exists")
-            return ibtracs_file
+            metadata = _read_download_metadata(meta_file)
+            try:
+                head = requests.head(url, timeout=30, allow_redirects=True)
+                head.raise_for_status()
+            except requests.RequestException as e:
+                print(f"✅ IBTrACS database already exists (update check failed: {e})")
+                return ibtracs_file
+            
+            if _is_up_to_date(head.headers, metadata, ibtracs_file):
+                if not metadata:
+                    _write_download_metadata(meta_file, head.headers)
+                print(f"✅ IBTrACS database already exists and is up to date")
+                return ibtracs_file
+            
+            print("🔄 IBTrACS database updated upstream")
         
         print("📥 Downloading IBTrACS database (this may take a few minutes)...")
         
-        url = "https://www.ncei.noaa.gov/data/international-best-track-archive-for-climate-stewardship-ibtracs/v04r01/access/csv/ibtracs.since1980.list.v04r01.csv"
+        # Write to a temporary file so an interrupted download never
+        # replaces a good database
+        tmp_file = ibtracs_file.with_suffix('.csv.part')
+        tmp_meta_file = tmp_file.with_name(tmp_file.name + '.meta.json')
         
         try:
-            response = requests.get(url, stream=True, timeout=300)
+            headers = {}
+            offset = 0
+            if tmp_file.exists():
+                partial = _read_download_metadata(tmp_meta_file)
+                validator = partial.get('etag') or partial.get('last_modified')
+                if validator:
+                    offset = tmp_file.stat().st_size
+                    headers = {'Range': f'bytes={offset}-', 'If-Range': validator}
+            
+            if not offset:
+                # Nothing to resume: try concurrent range requests
+                if head is None:
+                    try:
+                        head = requests.head(url, timeout=30, allow_redirects=True)
+                        head.raise_for_status()
+                    except requests.RequestException:
+                        head = None
+                total_size = int(head.headers.get('Content-Length') or 0) if head is not None else 0
+                if (head is not None
+                        and head.headers.get('Accept-Ranges') == 'bytes'
+                        and total_size >= PARALLEL_MIN_SIZE):
+                    print(f"   Fetching {total_size / (1024 * 1024):.0f} MB "
+                          f"in {PARALLEL_SEGMENTS} parallel ranges")
+                    validator = head.headers.get('ETag') or head.headers.get('Last-Modified')
+                    # No partial sidecar is written here: a pre-sized file with
+                    # holes must not be resumed by offset
+                    tmp_meta_file.unlink(missing_ok=True)
+                    if _download_ranges_parallel(url, tmp_file, total_size, validator):
+                        # Segments arrive out of order, so hash the whole file
+                        _write_download_metadata(tmp_meta_file, head.headers)
+                        sha256 = _hash_file(hashlib.sha256(), tmp_file).hexdigest()
+                        _verify_download(tmp_file, tmp_meta_file, sha256)
+                        os.replace(tmp_file, ibtracs_file)
+                        os.replace(tmp_meta_file, meta_file)
+                        print(f"✅ Downloaded IBTrACS database")
+                        return ibtracs_file
+                    print("   Server ignored range requests, using a single stream")
+            
+            if not offset and ibtracs_file.exists():
+                headers = _conditional_headers(metadata)
+            
+            response = requests.get(url, headers=headers, stream=True, timeout=300)
+            
+            if response.status_code == 304:
+                print(f"✅ IBTrACS database not modified")
+                return ibtracs_file
+            if response.status_code == 416:
+                # Partial file no longer matches upstream; start over next time
+                tmp_file.unlink(missing_ok=True)
+                tmp_meta_file.unlink(missing_ok=True)
             response.raise_for_status()
             
-            with open(ibtracs_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+            hasher = hashlib.sha256()
+            if response.status_code == 206:
+                print(f"   Resuming from {offset / (1024 * 1024):.1f} MB")
+                mode = 'ab'
+                _hash_file(hasher, tmp_file)
+            else:
+                # Full body (first attempt, or upstream changed): start over
+                mode = 'wb'
+                _write_download_metadata(tmp_meta_file, response.headers)
+            
+            written = 0
+            with open(tmp_file, mode) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
+                    hasher.update(chunk)
+                    written += len(chunk)
+            
+            # A dropped connection can end the body early without an error.
+            # Content-Length is only comparable when the body isn't encoded
+            expected_size = response.headers.get('Content-Length')
+            if (expected_size and 'Content-Encoding' not in response.headers
+                    and written != int(expected_size)):
+                raise IOError(f"Incomplete download: {written} of {expected_size} bytes")
+            
+            _verify_download(tmp_file, tmp_meta_file, hasher.hexdigest())
+            os.replace(tmp_file, ibtracs_file)
+            os.replace(tmp_meta_file, meta_file)
             
             print(f"✅ Downloaded IBTrACS database")
             return ibtracs_file
             
         except Exception as e:
             print(f"❌ Error downloading IBTrACS: {e}")
+            if ibtracs_file.exists():
+                print("   Using existing (possibly outdated) database")
+                return ibtracs_file
             print("   You can manually download from:")
             print("   https://www.ncei.noaa.gov/data/international-best-track-archive-for-climate-stewardship-ibtracs/")
             return None
@@ -68,20 +528,18 @@ class IBTracsExtractor:
         if ibtracs_file is None:
             return self._create_synthetic_track()
         
-        # Load IBTrACS
+        # Load this cyclone from IBTrACS
+        # Note: Late-season cyclones may be listed in SEASON = year+1 (e.g., Nov 2024 → SEASON=2025)
         try:
-            df = pd.read_csv(ibtracs_file, skiprows=[1], low_memory=False)
+            track = _read_ibtracs_track(
+                ibtracs_file,
+                self.cyclone['name'],
+                [self.cyclone['year'], self.cyclone['year'] + 1]
+            )
         except Exception as e:
             print(f"❌ Error reading IBTrACS: {e}")
             return self._create_synthetic_track()
         
-        # Filter for this cyclone
-        # Note: Late-season cyclones may be listed in SEASON = year+1 (e.g., Nov 2024 → SEASON=2025)
-        track = df[
-            (df['NAME'].str.upper() == self.cyclone['name'].upper()) &
-            ((df['SEASON'] == self.cyclone['year']) | (df['SEASON'] == self.cyclone['year'] + 1))
-        ].copy()
-        
         if len(track) == 0:
             print(f"⚠️  {self.cyclone['name']} not found in IBTrACS")
             print("   Cyclone may be too recent or not yet in database")
@@ -94,8 +552,8 @@ class IBTracsExtractor:
         track = self._process_track_data(track)
         
         # Save
-        output_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track.csv')
-        track.to_csv(output_file, index=False)
+        output_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track.parquet')
+        track.to_parquet(output_file, compression='zstd', index=False)
         print(f"✅ Saved track: {output_file}")
         
         self._print_track_summary(track)
@@ -113,7 +571,7 @@ class IBTracsExtractor:
         track['WMO_PRES'] = pd.to_numeric(track['WMO_PRES'], errors='coerce')
         
         # Add intensity categories
-        track['intensity_category'] = track['WMO_WIND'].apply(self._categorize_intensity)
+        track['intensity_category'] = self._categorize_intensity(track['WMO_WIND'])
         
         # Add metadata
         track['cyclone_name'] = self.cyclone['name']
@@ -126,23 +584,18 @@ class IBTracsExtractor:
         return track
     
     def _categorize_intensity(self, wind_kts):
-        """Categorize cyclone intensity from wind speed"""
-        if pd.isna(wind_kts):
-            return 'Unknown'
-        elif wind_kts < 34:
-            return 'Tropical Depression'
-        elif wind_kts < 64:
-            return 'Tropical Storm'
-        elif wind_kts < 83:
-            return 'Category 1'
-        elif wind_kts < 96:
-            return 'Category 2'
-        elif wind_kts < 113:
-            return 'Category 3'
-        elif wind_kts < 137:
-            return 'Category 4'
-        else:
-            return 'Category 5'
+        """
+        Categorize cyclone intensity from wind speed (vectorized)
+        
+        Parameters:
+            wind_kts (Series): Wind speeds in knots (NaN = unknown)
+        
+        Returns:
+            ndarray: Category label per value
+        """
+        wind = wind_kts.to_numpy(dtype=np.float64, na_value=np.nan)
+        labels = _INTENSITY_LABELS[np.searchsorted(_INTENSITY_BINS, wind, side='right')]
+        return np.where(np.isnan(wind), 'Unknown', labels)
     
     def _create_synthetic_track(self):
         """
@@ -194,15 +647,15 @@ class IBTracsExtractor:
             })
         
         track = pd.DataFrame(track_data)
-        track['intensity_category'] = track['WMO_WIND'].apply(self._categorize_intensity)
+        track['intensity_category'] = self._categorize_intensity(track['WMO_WIND'])
         track['cyclone_name'] = self.cyclone['name']
         track['cyclone_year'] = self.cyclone['year']
         track['analysis_id'] = self.cyclone_id
         track['data_source'] = 'synthetic'
         
         # Save
-        output_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track_synthetic.csv')
-        track.to_csv(output_file, index=False)
+        output_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track_synthetic.parquet')
+        track.to_parquet(output_file, compression='zstd', index=False)
         print(f"✅ Saved synthetic track: {output_file}")
         print(f"   ⚠️  Note: Positions are approximate. Update with real data if available.")
         
@@ -225,17 +678,20 @@ class IBTracsExtractor:
     def get_track(self):
         """Get track (load if exists, extract if not)"""
         
-        track_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track.csv')
-        synthetic_file = paths.get_file('ibtracs_processed', f'{self.cyclone_id}_track_synthetic.csv')
-        
-        if track_file.exists():
-            print(f"✅ Loading existing track: {track_file.name}")
-            return pd.read_csv(track_file, parse_dates=['ISO_TIME'])
-        elif synthetic_file.exists():
-            print(f"✅ Loading existing synthetic track: {synthetic_file.name}")
-            return pd.read_csv(synthetic_file, parse_dates=['ISO_TIME'])
-        else:
-            return self.extract_track()
+        # Parquet first; CSV tracks are from older versions of this module
+        for stem, label in ((f'{self.cyclone_id}_track', 'track'),
+                            (f'{self.cyclone_id}_track_synthetic', 'synthetic track')):
+            track_file = paths.get_file('ibtracs_processed', f'{stem}.parquet')
+            if track_file.exists():
+                print(f"✅ Loading existing {label}: {track_file.name}")
+                return pd.read_parquet(track_file)
+            
+            track_file = paths.get_file('ibtracs_processed', f'{stem}.csv')
+            if track_file.exists():
+                print(f"✅ Loading existing {label}: {track_file.name}")
+                return pd.read_csv(track_file, parse_dates=['ISO_TIME'])
+        
+        return self.extract_track()
 
 # Convenience function
 def get_cyclone_track(config=None):
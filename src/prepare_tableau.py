@@ -6,12 +6,28 @@ Aggregates data and exports to optimized Excel format
 import pandas as pd
 import geopandas as gpd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
+import io
 import logging
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
 import xlsxwriter
 from src.config import OUTPUT_DIR, OOKLA_DIR, TABLEAU_CONFIG
 
+try:
+    # Optional: JIT-compiled, multi-core quadkey decoding
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +36,495 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+if njit is not None:
+    # Compiled lazily on first call: starting numba's threading layer at
+    # import time would leave forked child processes unable to exit
+    @njit(parallel=True, cache=True)
+    def _decode_quadkey_codes_nb(codes, out_lat, out_lon):
+        """
+        Decode an (N, L) matrix of quadkey ASCII codes into out_lat/out_lon
+        
+        Rows are independent, so prange spreads them across all cores.
+        """
+        n_rows, level_of_detail = codes.shape
+        map_size = float(256 << level_of_detail)
+        for i in prange(n_rows):
+            tile_x = 0
+            tile_y = 0
+            for j in range(level_of_detail):
+                digit = codes[i, j] - 48
+                tile_x = (tile_x << 1) | (digit & 1)
+                tile_y = (tile_y << 1) | ((digit >> 1) & 1)
+            x = ((tile_x * 256 + 128) / map_size) - 0.5
+            y = 0.5 - ((tile_y * 256 + 128) / map_size)
+            out_lon[i] = 360 * x
+            out_lat[i] = 90 - 360 * np.arctan(np.exp(-y * 2 * np.pi)) / np.pi
+else:
+    _decode_quadkey_codes_nb = None
+
+
+def _excel_rows(df):
+    """
+    Yield DataFrame rows as tuples of Python values for worksheet.write_row
+    
+    Matches DataFrame.to_excel output: missing values become empty cells
+    and infinities the strings 'inf'/'-inf'. Timestamps are converted to
+    naive datetime.datetime once per column rather than per cell.
+    
+    Parameters:
+        df (DataFrame): Data to write
+    
+    Returns:
+        iterator: One tuple per row
+    """
+    cells = df.astype(object)
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(df[col]):
+            values = df[col].to_numpy()
+            cells.loc[np.isposinf(values), col] = 'inf'
+            cells.loc[np.isneginf(values), col] = '-inf'
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            stamps = df[col].dt.tz_localize(None) if df[col].dt.tz is not None else df[col]
+            cells[col] = pd.Series(stamps.dt.to_pydatetime(), index=df.index, dtype=object)
+    cells = cells.where(df.notna(), None)
+    return cells.itertuples(index=False, name=None)
+
+
+# User-space buffer for xlsx output; the zip container issues many small writes
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Rows rendered to XML at a time by _create_excel_file_fast; bounds the cell
+# strings held in memory to one block instead of the whole sheet
+XLSX_ROW_BLOCK_SIZE = 50_000
+
+# Excel serial dates count days from 1899-12-30 (1900 date system)
+_EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+# Fixed parts of the xlsx package written by _create_excel_file_fast
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Style 0 is the default, style 1 the header, style 2 datetimes (same look
+# and number format as the xlsxwriter path)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF4472C4"/><bgColor indexed="64"/></patternFill></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"><color auto="1"/></left><right style="thin"><color auto="1"/></right>'
+    '<top style="thin"><color auto="1"/></top><bottom style="thin"><color auto="1"/></bottom><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetFormatPr defaultRowHeight="15"/>'
+    '<cols>{cols}</cols><sheetData>'
+)
+_XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+_XML_ILLEGAL_CHARS = r'[\x00-\x08\x0b\x0c\x0e-\x1f]'
+
+
+def _xml_text_cells(text):
+    """Wrap a Series of Python strings as inline string cells"""
+    text = (text.str.replace('&', '&amp;', regex=False)
+                .str.replace('<', '&lt;', regex=False)
+                .str.replace('>', '&gt;', regex=False)
+                .str.replace(_XML_ILLEGAL_CHARS, '', regex=True))
+    return '<c t="inlineStr"><is><t xml:space="preserve">' + text + '</t></is></c>'
+
+
+def _xml_cells(series):
+    """
+    Render a column as SpreadsheetML <c> elements, one string per row
+    
+    Values follow the xlsxwriter path: numbers with 16 significant digits,
+    datetimes as serial numbers in the date style (s="2"), missing values
+    as empty cells and infinities as the strings 'inf'/'-inf'.
+    
+    Parameters:
+        series (Series): Column data
+    
+    Returns:
+        ndarray: Cell XML for every row
+    """
+    missing = series.isna().to_numpy()
+    cells = np.full(len(series), '<c/>', dtype=object)
+    if pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=bool, na_value=False)
+        cells[~missing] = np.where(values, '<c t="b"><v>1</v></c>', '<c t="b"><v>0</v></c>')[~missing]
+    elif pd.api.types.is_integer_dtype(series):
+        text = series[~missing].astype('int64').astype(str)
+        cells[~missing] = ('<c><v>' + text + '</v></c>').to_numpy()
+    elif pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = np.isfinite(values)
+        cells[finite] = np.char.add(np.char.add('<c><v>', np.char.mod('%.16G', values[finite])),
+                                    '</v></c>').astype(object)
+        infinite = np.isinf(values)
+        if infinite.any():
+            text = pd.Series(np.where(values[infinite] > 0, 'inf', '-inf'))
+            cells[infinite] = _xml_text_cells(text).to_numpy()
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        stamps = series.dt.tz_localize(None) if series.dt.tz is not None else series
+        days = ((stamps[~missing] - _EXCEL_EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64)
+        cells[~missing] = np.char.add(np.char.add('<c s="2"><v>', np.char.mod('%.16G', days)),
+                                      '</v></c>').astype(object)
+    else:
+        text = series[~missing].astype(str).astype(object)
+        cells[~missing] = _xml_text_cells(text).to_numpy()
+    return cells
+
+
+# Columns _aggregate_data and _print_summary use; geometry and tile WKT are never read
+TABLEAU_INPUT_COLUMNS = {
+    'quadkey', 'year', 'quarter', 'data_type',
+    'avg_d_kbps', 'avg_u_kbps', 'avg_lat_ms', 'tests', 'devices',
+    'avg_d_mbps', 'avg_u_mbps',
+    'name', 'region', 'country', 'latitude', 'longitude',
+}
+
+
+# Low-cardinality string keys, kept dictionary-encoded so grouping hashes ints
+CATEGORY_COLUMNS = ('data_type', 'region', 'country', 'name')
+
+
+# Files above this many rows are aggregated batch by batch
+AGG_BATCH_SIZE = 500_000
+
+
+def _read_input_table(file_path):
+    """
+    Read the Tableau input columns of a parquet file as an Arrow table
+    
+    Parameters:
+        file_path (Path): Ookla geoparquet file
+    
+    Returns:
+        pyarrow.Table: Input columns, category columns dictionary-encoded
+    """
+    columns = _input_columns(file_path)
+    return pq.read_table(file_path, columns=columns,
+                         read_dictionary=[c for c in CATEGORY_COLUMNS if c in columns])
+
+
+def _open_input_file(file_path):
+    """
+    Open a parquet file for batched reading of the Tableau input columns
+    
+    Parameters:
+        file_path (Path): Ookla geoparquet file
+    
+    Returns:
+        ParquetFile: Reader with category columns dictionary-encoded
+    """
+    columns = _input_columns(file_path)
+    return pq.ParquetFile(file_path, read_dictionary=[c for c in CATEGORY_COLUMNS if c in columns])
+
+
+def _input_columns(file_path):
+    """
+    List the columns of a parquet file needed for Tableau, in file order
+    
+    Parameters:
+        file_path (Path): Ookla geoparquet file
+    
+    Returns:
+        list: Column names to read
+    """
+    names = pq.ParquetFile(file_path).schema_arrow.names
+    return [name for name in names if name in TABLEAU_INPUT_COLUMNS]
+
+
+def _agg_funcs(funcs):
+    """Normalize an agg_dict entry ('sum' or ['mean', 'min']) to a list"""
+    return [funcs] if isinstance(funcs, str) else list(funcs)
+
+
+def _partial_aggregates(table, group_cols, agg_dict):
+    """
+    Aggregate one batch into per-key partial statistics
+    
+    Keeps count, sum and the sum of squared deviations from the batch mean
+    (M2, for std) plus min/max, which can be merged across batches by
+    _combine_partial_aggregates.
+    
+    Parameters:
+        table (pyarrow.Table): One batch of raw data
+        group_cols (list): Grouping keys
+        agg_dict (dict): Column -> aggregation function(s)
+    
+    Returns:
+        pyarrow.Table: Keys plus <col>__count/__sum/__m2/__min/__max
+    """
+    aggs = {}
+    for col, funcs in agg_dict.items():
+        funcs = _agg_funcs(funcs)
+        aggs[f"{col}__count"] = (col, 'count', None)
+        if {'sum', 'mean', 'std'} & set(funcs):
+            aggs[f"{col}__sum"] = (col, 'sum', None)
+        if 'std' in funcs:
+            # Population variance times count is the batch's M2
+            aggs[f"{col}__m2"] = (col, 'variance', pc.VarianceOptions(ddof=0))
+        for func in ('min', 'max'):
+            if func in funcs:
+                aggs[f"{col}__{func}"] = (col, func, None)
+    
+    # Arrow names each aggregate <column>_<function>
+    result = table.group_by(group_cols).aggregate(
+        [(col, func) if options is None else (col, func, options) for col, func, options in aggs.values()]
+    )
+    result = result.select(group_cols + [f"{col}_{func}" for col, func, _ in aggs.values()])
+    result = result.rename_columns(group_cols + list(aggs))
+    for col in agg_dict:
+        if f"{col}__m2" in aggs:
+            index = result.schema.get_field_index(f"{col}__m2")
+            count = pc.cast(result.column(f"{col}__count"), pa.float64())
+            m2 = pc.fill_null(pc.multiply(result.column(index), count), 0.0)
+            result = result.set_column(index, f"{col}__m2", m2)
+    return result
+
+
+def _combine_partial_aggregates(partials, group_cols, agg_dict):
+    """
+    Merge per-batch partial statistics into the final aggregates
+    
+    Counts, sums, minima and maxima merge directly. M2 merges with Chan's
+    parallel update, M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2), which
+    avoids the cancellation of the sum-of-squares formula on large values.
+    
+    Parameters:
+        partials (list): Tables from _partial_aggregates
+        group_cols (list): Grouping keys
+        agg_dict (dict): Column -> aggregation function(s)
+    
+    Returns:
+        pyarrow.Table: Keys plus <col>_<func> columns
+    """
+    table = pa.concat_tables(partials).unify_dictionaries()
+    table = table.append_column('__row', pa.array(np.arange(table.num_rows)))
+    stats = [name for name in table.column_names
+             if name not in group_cols and name != '__row' and not name.endswith('__m2')]
+    merge_func = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+    merged_funcs = [merge_func[name.rsplit('__', 1)[1]] for name in stats]
+    merged = table.group_by(group_cols).aggregate(list(zip(stats, merged_funcs)) + [('__row', 'list')])
+    
+    # Output group of every partial row (a join would drop null keys)
+    rows = merged.column('__row_list').combine_chunks()
+    group_of = np.empty(table.num_rows, dtype=np.int64)
+    group_of[pc.list_flatten(rows).to_numpy()] = pc.list_parent_indices(rows).to_numpy()
+    
+    merged = merged.select(group_cols + [f"{name}_{func}" for name, func in zip(stats, merged_funcs)])
+    merged = merged.rename_columns(group_cols + stats)
+    
+    columns = {col: merged.column(col) for col in group_cols}
+    for col, funcs in agg_dict.items():
+        count = pc.cast(merged.column(f"{col}__count"), pa.float64())
+        for func in _agg_funcs(funcs):
+            if func == 'mean':
+                values = pc.if_else(pc.greater(count, 0),
+                                    pc.divide(merged.column(f"{col}__sum"), count), None)
+            elif func == 'std':
+                # Sample (ddof=1) std from the Chan-merged M2
+                n = pc.cast(table.column(f"{col}__count"), pa.float64()).to_numpy()
+                total = pc.cast(table.column(f"{col}__sum"), pa.float64()).to_numpy(zero_copy_only=False)
+                n_all = count.to_numpy()
+                total_all = pc.cast(merged.column(f"{col}__sum"), pa.float64()).to_numpy(zero_copy_only=False)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mean = np.where(n > 0, total / n, 0.0)
+                    mean_all = np.where(n_all > 0, total_all / n_all, 0.0)
+                    spread = np.where(n > 0, n * (mean - mean_all[group_of]) ** 2, 0.0)
+                m2 = np.bincount(group_of, weights=table.column(f"{col}__m2").to_numpy() + spread,
+                                 minlength=merged.num_rows)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values = pa.array(np.sqrt(m2 / (n_all - 1.0)), mask=n_all < 2)
+            else:
+                values = merged.column(f"{col}__{func}")
+            columns[f"{col}_{func}"] = values
+    return pa.table(columns)
+
+
+def _pct_change(current, reference):
+    """
+    Percent change from reference to current
+    
+    Reference values of zero or below have no meaningful change and give NaN
+    instead of an infinity.
+    
+    Parameters:
+        current (Series): New values
+        reference (Series): Values to compare against
+    
+    Returns:
+        ndarray: Percent changes
+    """
+    current = np.asarray(current, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(reference > 0, (current - reference) / reference * 100, np.nan)
+
+
+def _as_path_list(paths):
+    """Normalize a writer result (one path or a list of part paths) to a list"""
+    return paths if isinstance(paths, list) else [paths]
+
+
+def _estimate_col_width(col, series):
+    """
+    Estimate an Excel column width without turning the column into strings
+    
+    Numbers are sized from their largest magnitude, categoricals from their
+    categories, and text from the native string length kernel.
+    
+    Parameters:
+        col (str): Column name
+        series (Series): Column data
+    
+    Returns:
+        int: Column width (header length + 2, capped at 50)
+    """
+    if pd.api.types.is_bool_dtype(series):
+        width = 5
+    elif pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = values[np.isfinite(values)]
+        largest = np.abs(finite).max() if len(finite) else 0
+        width = len(f"{largest:.0f}") + (finite < 0).any()
+        if pd.api.types.is_float_dtype(series):
+            width += 7  # Decimal point and the digits Excel shows by default
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        width = 19
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str)
+        width = categories.str.len().max() if len(categories) else 0
+    else:
+        try:
+            width = series.str.len().max()
+        except AttributeError:
+            # Mixed objects: size from a sample
+            width = series.head(1000).astype(str).str.len().max()
+    if pd.isna(width):
+        width = 0
+    return int(min(max(width, len(str(col))) + 2, 50))
+
+
+def _decode_quadkeys(quadkeys):
+    """
+    Decode Bing Maps quadkeys to latitude/longitude (center of tile), vectorized
+    
+    Same algorithm as TableauDataPreparer._decode_quadkey_to_latlon, run on
+    a whole column at once: each quadkey becomes a row of base-4 digits whose
+    low/high bits are the tile X/Y bits. Quadkeys of different lengths (zoom
+    levels) are decoded in one batch per length. Uses the numba kernel when
+    numba is installed.
+    
+    Parameters:
+        quadkeys (array-like): Quadkey strings
+    
+    Returns:
+        tuple: (latitude, longitude) float64 arrays, NaN for missing quadkeys
+    """
+    # Detect missing keys before astype(str) turns them into 'nan'/'None'
+    quadkeys = pd.Series(quadkeys)
+    missing = quadkeys.isna().to_numpy()
+    
+    # Read the digits straight from the Arrow string buffers: no per-row
+    # Python strings or intermediate lists
+    keys = pa.array(quadkeys.astype(str).where(~missing, ''), type=pa.large_string())
+    if isinstance(keys, pa.ChunkedArray):
+        # Arrow-backed string columns convert to one array per chunk
+        keys = keys.combine_chunks()
+    _, offsets, data = keys.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[keys.offset:keys.offset + len(keys) + 1]
+    data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.empty(0, dtype=np.uint8)
+    starts = offsets[:-1]
+    lengths = np.diff(offsets)
+    latitude = np.empty(len(keys), dtype=np.float64)
+    longitude = np.empty(len(keys), dtype=np.float64)
+    
+    for level_of_detail in np.unique(lengths):
+        level_of_detail = int(level_of_detail)
+        rows = lengths == level_of_detail
+        codes = data[starts[rows][:, None] + np.arange(level_of_detail)]
+        
+        if _decode_quadkey_codes_nb is not None:
+            level_lat = np.empty(len(codes), dtype=np.float64)
+            level_lon = np.empty(len(codes), dtype=np.float64)
+            _decode_quadkey_codes_nb(codes, level_lat, level_lon)
+            latitude[rows] = level_lat
+            longitude[rows] = level_lon
+            continue
+        
+        digits = codes - ord('0')
+        
+        # Digit bit 0 is the tile X bit, bit 1 the tile Y bit
+        weights = np.left_shift(1, np.arange(level_of_detail - 1, -1, -1, dtype=np.int64))
+        tile_x = (digits & 1).astype(np.int64) @ weights
+        tile_y = ((digits >> 1) & 1).astype(np.int64) @ weights
+        
+        # Convert tile coordinates to pixel coordinates (center of tile)
+        map_size = 256 << level_of_detail
+        pixel_x = (tile_x * 256) + 128
+        
+        # Convert pixel coordinates to lat/lon
+        x = (pixel_x / map_size) - 0.5
+        longitude[rows] = 360 * x
+        
+        # Latitude only depends on tile_y: with more rows than possible tile_y
+        # values, evaluate arctan/exp once per tile row and look it up
+        use_table = (1 << level_of_detail) <= len(codes)
+        if use_table:
+            pixel_y = (np.arange(1 << level_of_detail, dtype=np.int64) * 256) + 128
+        else:
+            pixel_y = (tile_y * 256) + 128
+        y = 0.5 - (pixel_y / map_size)
+        lat = 90 - 360 * np.arctan(np.exp(-y * 2 * np.pi)) / np.pi
+        latitude[rows] = lat[tile_y] if use_table else lat
+    
+    latitude[missing] = np.nan
+    longitude[missing] = np.nan
+    return latitude, longitude
+
+
 class TableauDataPreparer:
     """
     Prepare Ookla data for Tableau by aggregating and optimizing
@@ -52,7 +557,7 @@ class TableauDataPreparer:
             combine (bool): If True, combine all files into one Excel. Default False.
         
         Returns:
-            dict: Paths to generated Excel files
+            dict: Paths to generated Excel files (lists of part files when split)
         
         Example:
             >>> # Process files individually (default)
@@ -98,22 +603,34 @@ class TableauDataPreparer:
             print(f"📦 Mode: INDIVIDUAL - Each file gets its own Excel")
             print(f"   Processing {len(normalized_paths)} file(s)...\n")
             
-            for file_path in normalized_paths:
-                print(f"\n{'─'*70}")
-                print(f"Processing: {file_path.name}")
-                print(f"{'─'*70}")
-                
-                file_outputs = self._prepare_single_file(file_path)
-                output_files.update(file_outputs)
+            # Files are independent, so each one can get its own process.
+            # Workers are spawned, not forked: a fork after numba's threading
+            # layer has started hangs the parent at exit
+            max_workers = min(len(normalized_paths), os.cpu_count() or 1)
+            tasks = [(file_path, self.output_dir) for file_path in normalized_paths]
+            
+            if max_workers > 1:
+                with ProcessPoolExecutor(max_workers=max_workers,
+                                         mp_context=multiprocessing.get_context('spawn')) as pool:
+                    # Each worker's captured progress, printed in input order
+                    for file_outputs, progress in pool.map(_prepare_single_file_worker, tasks):
+                        print(progress, end='')
+                        output_files.update(file_outputs)
+            else:
+                # In-process: nothing can interleave, so progress prints live
+                for file_path in normalized_paths:
+                    _print_file_header(file_path)
+                    output_files.update(self._prepare_single_file(file_path))
         
         print(f"\n{'='*70}")
         print(f"✅ TABLEAU FILES READY!")
         print(f"{'='*70}")
-        print(f"Created {len(output_files)} Excel file(s) in: {self.output_dir}")
+        print(f"Created {len(output_files)} Tableau file(s) in: {self.output_dir}")
         print(f"\n📁 Output files:")
-        for file_type, file_path in output_files.items():
-            size_mb = file_path.stat().st_size / (1024 * 1024)
-            print(f"   • {file_path.name} ({size_mb:.1f} MB)")
+        for file_type, file_paths in output_files.items():
+            for file_path in _as_path_list(file_paths):
+                size_mb = file_path.stat().st_size / (1024 * 1024)
+                print(f"   • {file_path.name} ({size_mb:.1f} MB)")
         print(f"{'='*70}\n")
         
         return output_files
@@ -121,24 +638,25 @@ class TableauDataPreparer:
     def _prepare_single_file(self, file_path):
         """Prepare a single file for Tableau"""
         logger.info(f"Loading: {file_path.name}")
-        df = pd.read_parquet(file_path)
+        parquet_file = _open_input_file(file_path)
         
-        print(f"   Records: {len(df):,}")
+        print(f"   Records: {parquet_file.metadata.num_rows:,}")
         
-        # Aggregate data
-        aggregated = self._aggregate_data(df)
+        # Aggregate data (streamed in batches for large files)
+        aggregated = self._aggregate_data(parquet_file)
         
         # Generate output name from filename
         output_name = file_path.stem  # Remove .geoparquet extension
         
-        # Export to Excel
-        output_path = self._create_excel_file(
+        # Export to Excel (or parquet/csv.gz, see TABLEAU_CONFIG['format'])
+        output_path = self._write_output(
             aggregated,
             self.output_dir / f"{output_name}.xlsx",
             "Data"
         )
         
-        print(f"   ✅ Created: {output_path.name}")
+        for path in _as_path_list(output_path):
+            print(f"   ✅ Created: {path.name}")
         
         return {file_path.stem: output_path}
     
@@ -147,20 +665,19 @@ class TableauDataPreparer:
         all_data = []
         for file_path in file_paths:
             logger.info(f"Loading: {file_path.name}")
-            df = pd.read_parquet(file_path)
-            all_data.append(df)
+            all_data.append(_read_input_table(file_path))
         
-        # Combine all data
-        combined = pd.concat(all_data, ignore_index=True)
-        logger.info(f"✅ Combined {len(combined):,} total records")
+        # Combine all data (stays columnar; no copy for matching schemas)
+        combined = pa.concat_tables(all_data, promote_options='permissive').unify_dictionaries()
+        logger.info(f"✅ Combined {combined.num_rows:,} total records")
         
         # Prepare data
         aggregated = self._aggregate_data(combined)
         
         # Generate output name
         timestamp = datetime.now().strftime('%Y%m%d')
-        if 'region' in combined.columns:
-            region = combined['region'].iloc[0].lower().replace(' ', '_')
+        if 'region' in combined.column_names:
+            region = combined.column('region')[0].as_py().lower().replace(' ', '_')
             output_name = f"{region}_tableau_{timestamp}"
         else:
             output_name = f"ookla_tableau_{timestamp}"
@@ -220,22 +737,42 @@ class TableauDataPreparer:
         """
         Aggregate data by bin (quadkey) and time period
         
+        The groupby runs in Arrow (multi-threaded, no pandas object columns);
+        only the aggregated result is converted to pandas. A ParquetFile with
+        more than AGG_BATCH_SIZE rows is streamed in batches whose partial
+        statistics are merged at the end, so memory follows the number of
+        bins rather than the number of rows.
+        
         Parameters:
-            df (DataFrame): Raw Ookla data
+            df (DataFrame, pyarrow.Table or ParquetFile): Raw Ookla data
         
         Returns:
             DataFrame: Aggregated data
         """
         print(f"\n📦 Aggregating data to bins...")
         
-        # Decode quadkeys to lat/lon if not already present
-        if 'latitude' not in df.columns or 'longitude' not in df.columns:
-            print(f"   🗺️  Decoding quadkeys to lat/lon coordinates...")
-            import numpy as np
-            latlon_data = df['quadkey'].apply(self._decode_quadkey_to_latlon)
-            df['latitude'] = [x[0] for x in latlon_data]
-            df['longitude'] = [x[1] for x in latlon_data]
-            print(f"   ✅ Added lat/lon columns for Tableau mapping")
+        if isinstance(df, pq.ParquetFile):
+            column_names = [c for c in df.schema_arrow.names if c in TABLEAU_INPUT_COLUMNS]
+            num_rows = df.metadata.num_rows
+            # Only a file can be streamed; in-memory tables are aggregated whole
+            batched = num_rows > AGG_BATCH_SIZE
+            if batched:
+                batches = (pa.Table.from_batches([batch]) for batch in
+                           df.iter_batches(batch_size=AGG_BATCH_SIZE, columns=column_names))
+            else:
+                batches = [df.read(columns=column_names)]
+        else:
+            table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(pd.DataFrame(df), preserve_index=False)
+            column_names = table.column_names
+            num_rows = table.num_rows
+            batched = False
+            batches = [table]
+        
+        # Lat/lon only depend on the quadkey, so missing coordinates are
+        # decoded after the groupby, once per output row
+        decode_latlon = 'latitude' not in column_names or 'longitude' not in column_names
+        if decode_latlon:
+            column_names = [c for c in column_names if c not in ('latitude', 'longitude')]
         
         # Define aggregation rules
         agg_dict = {
@@ -247,9 +784,9 @@ class TableauDataPreparer:
         }
         
         # Add optional columns if they exist
-        if 'avg_d_mbps' in df.columns:
+        if 'avg_d_mbps' in column_names:
             agg_dict['avg_d_mbps'] = ['mean', 'min', 'max']
-        if 'avg_u_mbps' in df.columns:
+        if 'avg_u_mbps' in column_names:
             agg_dict['avg_u_mbps'] = ['mean', 'min', 'max']
         
         # Group by bin and time period
@@ -257,23 +794,67 @@ class TableauDataPreparer:
         
         # Add optional grouping columns
         for col in ['name', 'region', 'country', 'latitude', 'longitude']:
-            if col in df.columns:
+            if col in column_names:
                 group_cols.append(col)
         
         # Filter agg_dict to only include existing columns
-        agg_dict = {k: v for k, v in agg_dict.items() if k in df.columns}
-        
-        # Perform aggregation
-        aggregated = df.groupby(group_cols, dropna=False).agg(agg_dict)
+        agg_dict = {k: v for k, v in agg_dict.items() if k in column_names}
+        
+        # Arrow aggregation spec; std is the sample (ddof=1) std like pandas
+        aggs = []
+        agg_names = []
+        agg_columns = []
+        for col, funcs in agg_dict.items():
+            for func in _agg_funcs(funcs):
+                if func == 'std':
+                    aggs.append((col, 'stddev', pc.VarianceOptions(ddof=1)))
+                    agg_names.append(f"{col}_stddev")
+                else:
+                    aggs.append((col, func))
+                    agg_names.append(f"{col}_{func}")
+                agg_columns.append(f"{col}_{func}")
+        
+        # Perform aggregation (null keys form their own group, like dropna=False)
+        partials = []
+        for table in batches:
+            # Group on dictionary codes rather than strings
+            table = table.select(group_cols + list(agg_dict))
+            for col in CATEGORY_COLUMNS:
+                if col in group_cols and not pa.types.is_dictionary(table.schema.field(col).type):
+                    table = table.set_column(table.schema.get_field_index(col), col,
+                                             pc.dictionary_encode(table.column(col)))
+            
+            if batched:
+                partials.append(_partial_aggregates(table, group_cols, agg_dict))
+            else:
+                result = table.group_by(group_cols).aggregate(aggs)
+                result = result.select(group_cols + agg_names).rename_columns(group_cols + agg_columns)
+        
+        if partials:
+            result = _combine_partial_aggregates(partials, group_cols, agg_dict)
+        
+        # Sort like pandas groupby; Arrow cannot sort dictionary columns, so
+        # sort on their decoded values and keep the dictionaries in the result
+        sort_keys = pa.table({
+            col: (result.column(col).cast(result.column(col).type.value_type)
+                  if pa.types.is_dictionary(result.column(col).type) else result.column(col))
+            for col in group_cols
+        })
+        order = pc.sort_indices(sort_keys, sort_keys=[(col, 'ascending') for col in group_cols])
+        result = result.take(order)
+        aggregated = result.to_pandas(self_destruct=True, split_blocks=True)
         
-        # Flatten column names
-        aggregated.columns = ['_'.join(col).strip('_') if isinstance(col, tuple) else col 
-                              for col in aggregated.columns.values]
-        aggregated = aggregated.reset_index()
+        # Decode quadkeys to lat/lon if not already present
+        if decode_latlon:
+            print(f"   🗺️  Decoding quadkeys to lat/lon coordinates...")
+            latitude, longitude = _decode_quadkeys(aggregated['quadkey'])
+            aggregated.insert(len(group_cols), 'latitude', latitude)
+            aggregated.insert(len(group_cols) + 1, 'longitude', longitude)
+            print(f"   ✅ Added lat/lon columns for Tableau mapping")
         
         logger.info(f"✅ Aggregated to {len(aggregated):,} bins")
-        logger.info(f"   Compression: {len(df):,} → {len(aggregated):,} "
-                   f"({100*len(aggregated)/len(df):.1f}%)")
+        logger.info(f"   Compression: {num_rows:,} → {len(aggregated):,} "
+                   f"({100*len(aggregated)/num_rows:.1f}%)")
         
         return aggregated
     
@@ -286,14 +867,14 @@ class TableauDataPreparer:
             output_name (str): Base name for output files
         
         Returns:
-            dict: Paths to created files
+            dict: Paths to created files (lists of part files when split)
         """
-        print(f"\n💾 Exporting to Excel format...")
+        print(f"\n💾 Exporting to {TABLEAU_CONFIG.get('format', 'xlsx')} format...")
         
         output_files = {}
         
         # 1. Combined file (all data)
-        output_files['combined'] = self._create_excel_file(
+        output_files['combined'] = self._write_output(
             df,
             self.output_dir / f"{output_name}_combined.xlsx",
             "All Data"
@@ -303,7 +884,7 @@ class TableauDataPreparer:
         if 'data_type' in df.columns:
             mobile_data = df[df['data_type'] == 'mobile']
             if len(mobile_data) > 0:
-                output_files['mobile'] = self._create_excel_file(
+                output_files['mobile'] = self._write_output(
                     mobile_data,
                     self.output_dir / f"{output_name}_mobile.xlsx",
                     "Mobile"
@@ -313,7 +894,7 @@ class TableauDataPreparer:
         if 'data_type' in df.columns:
             fixed_data = df[df['data_type'] == 'fixed']
             if len(fixed_data) > 0:
-                output_files['fixed'] = self._create_excel_file(
+                output_files['fixed'] = self._write_output(
                     fixed_data,
                     self.output_dir / f"{output_name}_fixed.xlsx",
                     "Fixed"
@@ -328,20 +909,112 @@ class TableauDataPreparer:
                     self.output_dir / f"{output_name}_comparison.xlsx"
                 )
         
-        print(f"\n✅ Created {len(output_files)} Excel file(s):")
-        for file_type, file_path in output_files.items():
-            size_mb = file_path.stat().st_size / (1024 * 1024)
-            print(f"   • {file_type:15s}: {file_path.name} ({size_mb:.1f} MB)")
+        print(f"\n✅ Created {len(output_files)} Tableau file(s):")
+        for file_type, file_paths in output_files.items():
+            for file_path in _as_path_list(file_paths):
+                size_mb = file_path.stat().st_size / (1024 * 1024)
+                print(f"   • {file_type:15s}: {file_path.name} ({size_mb:.1f} MB)")
         
         return output_files
     
+    def _write_output(self, df, output_path, sheet_name="Data"):
+        """
+        Write one Tableau data file in the configured format
+        
+        TABLEAU_CONFIG['format'] selects 'xlsx' (default), 'parquet' (Snappy)
+        or 'csv.gz'; Tableau reads all three. For parquet and csv.gz the first
+        TABLEAU_CONFIG['excel_preview_rows'] rows are also written to a
+        <name>_preview.xlsx for a quick look in Excel (0 or None to skip).
+        
+        Parameters:
+            df (DataFrame): Data to export
+            output_path (Path): Destination path with an .xlsx suffix
+            sheet_name (str): Worksheet name for Excel output
+        
+        Returns:
+            Path or list: Written file, or the part paths of a split workbook
+        """
+        output_format = TABLEAU_CONFIG.get('format', 'xlsx')
+        
+        if output_format == 'xlsx':
+            return self._create_excel_file(df, output_path, sheet_name)
+        
+        if output_format == 'parquet':
+            data_path = output_path.with_suffix('.parquet')
+            df.to_parquet(data_path, engine='pyarrow', compression='snappy', index=False)
+        elif output_format == 'csv.gz':
+            data_path = output_path.with_suffix('.csv.gz')
+            df.to_csv(data_path, index=False, compression='gzip')
+        else:
+            raise ValueError(f"Unknown output format: {output_format} "
+                             f"(expected 'xlsx', 'parquet' or 'csv.gz')")
+        
+        logger.info(f"   {data_path.name}: {len(df):,} rows")
+        
+        preview_rows = TABLEAU_CONFIG.get('excel_preview_rows')
+        if preview_rows:
+            self._create_excel_file(
+                df.head(preview_rows),
+                output_path.with_stem(f"{output_path.stem}_preview"),
+                sheet_name
+            )
+        
+        return data_path
+    
     def _create_excel_file(self, df, output_path, sheet_name="Data"):
-        """Create a single Excel file with proper formatting"""
+        """
+        Create an Excel file with proper formatting
+        
+        Data above TABLEAU_CONFIG['excel_row_limit'] rows is split into
+        separate _part1.xlsx, _part2.xlsx, ... files, each written and closed
+        before the next one starts.
+        
+        Parameters:
+            df (DataFrame): Data to export
+            output_path (Path): Destination .xlsx file
+            sheet_name (str): Worksheet name
         
-        # Handle large files - split into multiple sheets
+        Returns:
+            Path or list: output_path, or the part paths when split
+        """
+        if TABLEAU_CONFIG.get('fast_writer', False):
+            write_file = self._create_excel_file_fast
+        else:
+            write_file = self._create_excel_file_xlsxwriter
+        
+        # Handle large files - split into multiple files
         max_rows = TABLEAU_CONFIG['excel_row_limit']
+        num_chunks = (len(df) - 1) // max_rows + 1
+        
+        if num_chunks <= 1:
+            return write_file(df, output_path, sheet_name)
+        
+        part_paths = []
+        for chunk_idx in range(num_chunks):
+            start_row = chunk_idx * max_rows
+            end_row = min((chunk_idx + 1) * max_rows, len(df))
+            part_path = output_path.with_stem(f"{output_path.stem}_part{chunk_idx+1}")
+            part_paths.append(write_file(df.iloc[start_row:end_row], part_path, sheet_name))
         
-        with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
+        logger.info(f"   Split {len(df):,} rows into {num_chunks} files")
+        
+        return part_paths
+    
+    def _create_excel_file_xlsxwriter(self, df, output_path, sheet_name="Data"):
+        """Write a single-sheet Excel file through xlsxwriter"""
+        
+        # constant_memory flushes each row as soon as the next one starts, so
+        # rows must be written strictly top to bottom (header first)
+        excel_options = {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        }
+        
+        with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f, \
+                pd.ExcelWriter(f, engine='xlsxwriter',
+                               engine_kwargs={'options': excel_options}) as writer:
             workbook = writer.book
             
             # Define formats
@@ -355,38 +1028,84 @@ class TableauDataPreparer:
             })
             
             number_format = workbook.add_format({'num_format': '#,##0.00'})
+            datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+            
+            worksheet = workbook.add_worksheet(sheet_name)
+            
+            # Datetime cells need an explicit format to display as dates
+            datetime_cols = [i for i, col in enumerate(df.columns)
+                             if pd.api.types.is_datetime64_any_dtype(df[col])]
+            
+            # Write formatted header, then the data row by row
+            worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+            for row_num, row in enumerate(_excel_rows(df), start=1):
+                worksheet.write_row(row_num, 0, row)
+                for i in datetime_cols:
+                    if row[i] is not None:
+                        worksheet.write_datetime(row_num, i, row[i], datetime_format)
+            
+            # Auto-fit columns
+            for i, col in enumerate(df.columns):
+                worksheet.set_column(i, i, _estimate_col_width(col, df[col]))
+            
+            # Freeze header row
+            worksheet.freeze_panes(1, 0)
+            
+            logger.info(f"   Sheet '{sheet_name}': {len(df):,} rows")
+        
+        return output_path
+    
+    def _create_excel_file_fast(self, df, output_path, sheet_name="Data"):
+        """
+        Write a single-sheet Excel file by streaming the sheet XML into the zip
+        
+        Produces the same cells, header style, column widths and frozen
+        header as the xlsxwriter path, but builds cell markup with vectorized
+        string operations, one block of XLSX_ROW_BLOCK_SIZE rows at a time,
+        instead of writing cell by cell. Cells carry no A1 references; Excel
+        places them in order.
+        
+        Parameters:
+            df (DataFrame): Data to export
+            output_path (Path): Destination .xlsx file
+            sheet_name (str): Worksheet name
+        
+        Returns:
+            Path: output_path
+        """
+        col_widths = [_estimate_col_width(col, df[col]) for col in df.columns]
+        cols_xml = ''.join(f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+                           for i, width in enumerate(col_widths, start=1))
+        header_xml = '<row r="1">' + ''.join(
+            f'<c t="inlineStr" s="1"><is><t xml:space="preserve">{escape(str(col))}</t></is></c>'
+            for col in df.columns
+        ) + '</row>'
+        
+        # Level 1 deflate: noticeably faster to close than the default 6 and
+        # only slightly larger on terse numeric XML
+        compresslevel = TABLEAU_CONFIG.get('zip_compresslevel', 1)
+        with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f, \
+                zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED,
+                                compresslevel=compresslevel) as zf:
+            zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+            zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+            zf.writestr('xl/workbook.xml', _XLSX_WORKBOOK.format(name=quoteattr(sheet_name)))
+            zf.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+            zf.writestr('xl/styles.xml', _XLSX_STYLES)
             
-            # Split into chunks if needed
-            num_chunks = (len(df) - 1) // max_rows + 1
+            # Buffer the many small row writes before they reach the compressor
+            with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as member, \
+                    io.BufferedWriter(member, buffer_size=OUTPUT_BUFFER_SIZE) as sheet:
+                sheet.write(_XLSX_SHEET_HEAD.format(cols=cols_xml).encode())
+                sheet.write(header_xml.encode())
+                for start in range(0, len(df), XLSX_ROW_BLOCK_SIZE):
+                    block = df.iloc[start:start + XLSX_ROW_BLOCK_SIZE]
+                    columns = [_xml_cells(block[col]) for col in block.columns]
+                    for r, cells in enumerate(zip(*columns), start=start + 2):
+                        sheet.write(f'<row r="{r}">{"".join(cells)}</row>'.encode())
+                sheet.write(_XLSX_SHEET_TAIL.encode())
             
-            for chunk_idx in range(num_chunks):
-                start_row = chunk_idx * max_rows
-                end_row = min((chunk_idx + 1) * max_rows, len(df))
-                chunk_data = df.iloc[start_row:end_row]
-                
-                chunk_sheet_name = f"{sheet_name}_{chunk_idx+1}" if num_chunks > 1 else sheet_name
-                
-                # Write data
-                chunk_data.to_excel(writer, sheet_name=chunk_sheet_name, index=False)
-                
-                worksheet = writer.sheets[chunk_sheet_name]
-                
-                # Format header
-                for col_num, value in enumerate(chunk_data.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                
-                # Auto-fit columns
-                for i, col in enumerate(chunk_data.columns):
-                    max_length = min(
-                        max(chunk_data[col].astype(str).str.len().max(), len(col)) + 2,
-                        50
-                    )
-                    worksheet.set_column(i, i, max_length)
-                
-                # Freeze header row
-                worksheet.freeze_panes(1, 0)
-                
-                logger.info(f"   Sheet '{chunk_sheet_name}': {len(chunk_data):,} rows")
+            logger.info(f"   Sheet '{sheet_name}': {len(df):,} rows")
         
         return output_path
     
@@ -410,48 +1129,46 @@ class TableauDataPreparer:
             return None
         
         # Calculate baseline metrics per quadkey
-        baseline_metrics = baseline.groupby('quadkey').agg({
-            'avg_d_kbps_mean': 'mean',
-            'avg_u_kbps_mean': 'mean',
-        }).rename(columns={
-            'avg_d_kbps_mean': 'baseline_d_kbps',
-            'avg_u_kbps_mean': 'baseline_u_kbps'
-        }).reset_index()
+        baseline_metrics = baseline.groupby('quadkey', observed=True)[
+            ['avg_d_kbps_mean', 'avg_u_kbps_mean']
+        ].mean()
         
-        # Merge with all data
-        comparison = df.merge(baseline_metrics, on='quadkey', how='left')
+        # Look up each row's baseline by quadkey (no merge of the full frame)
+        comparison = df.assign(
+            baseline_d_kbps=df['quadkey'].map(baseline_metrics['avg_d_kbps_mean']),
+            baseline_u_kbps=df['quadkey'].map(baseline_metrics['avg_u_kbps_mean']),
+        ).reset_index(drop=True)
         
         # Calculate percent changes from baseline (Q1)
-        comparison['d_kbps_pct_change'] = (
-            (comparison['avg_d_kbps_mean'] - comparison['baseline_d_kbps']) 
-            / comparison['baseline_d_kbps'] * 100
+        comparison['d_kbps_pct_change'] = _pct_change(
+            comparison['avg_d_kbps_mean'], comparison['baseline_d_kbps']
         )
-        comparison['u_kbps_pct_change'] = (
-            (comparison['avg_u_kbps_mean'] - comparison['baseline_u_kbps']) 
-            / comparison['baseline_u_kbps'] * 100
+        comparison['u_kbps_pct_change'] = _pct_change(
+            comparison['avg_u_kbps_mean'], comparison['baseline_u_kbps']
         )
         
-        # Calculate consecutive quarter changes (Q1→Q2→Q3→Q4→next year Q1)
-        # Sort by quadkey, then year, then quarter to ensure proper chronological order
-        comparison = comparison.sort_values(['quadkey', 'year', 'quarter'])
-        
         # Create a time_period column for easier sequential tracking (e.g., 2019.1, 2019.2, 2020.1)
         comparison['time_period'] = comparison['year'] + (comparison['quarter'] - 1) * 0.25
         
-        # Get previous quarter's values for each quadkey (works across years)
-        comparison['prev_d_kbps'] = comparison.groupby('quadkey')['avg_d_kbps_mean'].shift(1)
-        comparison['prev_u_kbps'] = comparison.groupby('quadkey')['avg_u_kbps_mean'].shift(1)
-        comparison['prev_year'] = comparison.groupby('quadkey')['year'].shift(1)
-        comparison['prev_quarter'] = comparison.groupby('quadkey')['quarter'].shift(1)
+        # Calculate consecutive quarter changes (Q1→Q2→Q3→Q4→next year Q1)
+        # Sort by quadkey, then time period to ensure proper chronological order;
+        # a categorical quadkey sorts on integer codes instead of strings
+        comparison['quadkey'] = comparison['quadkey'].astype('category')
+        comparison = comparison.sort_values(['quadkey', 'time_period'], kind='mergesort')
+        
+        # Get previous quarter's values for each quadkey (works across years),
+        # shifting all four columns with one grouper
+        shifted = comparison.groupby('quadkey', sort=False, observed=True)[
+            ['avg_d_kbps_mean', 'avg_u_kbps_mean', 'year', 'quarter']
+        ].shift(1)
+        comparison[['prev_d_kbps', 'prev_u_kbps', 'prev_year', 'prev_quarter']] = shifted.to_numpy()
         
         # Calculate quarter-over-quarter percent change
-        comparison['d_kbps_qoq_change'] = (
-            (comparison['avg_d_kbps_mean'] - comparison['prev_d_kbps']) 
-            / comparison['prev_d_kbps'] * 100
+        comparison['d_kbps_qoq_change'] = _pct_change(
+            comparison['avg_d_kbps_mean'], comparison['prev_d_kbps']
         )
-        comparison['u_kbps_qoq_change'] = (
-            (comparison['avg_u_kbps_mean'] - comparison['prev_u_kbps']) 
-            / comparison['prev_u_kbps'] * 100
+        comparison['u_kbps_qoq_change'] = _pct_change(
+            comparison['avg_u_kbps_mean'], comparison['prev_u_kbps']
         )
         
         # Add a flag to identify year transitions (2019 Q4 → 2020 Q1)
@@ -469,46 +1186,53 @@ class TableauDataPreparer:
         comparison['u_kbps_cumulative_change'] = comparison['u_kbps_pct_change']
         
         # Save to Excel
-        self._create_excel_file(comparison, output_path, "Comparison")
+        output_path = self._write_output(comparison, output_path, "Comparison")
         
         logger.info(f"✅ Created comparison file with baseline: {baseline_year} Q{baseline_quarter}")
         
         return output_path
     
-    def _print_summary(self, raw_df, agg_df):
-        """Print summary statistics"""
+    def _print_summary(self, raw_table, agg_df):
+        """
+        Print summary statistics
+        
+        Parameters:
+            raw_table (pyarrow.Table): Combined raw data
+            agg_df (DataFrame): Aggregated data
+        """
+        columns = raw_table.column_names
         
         print(f"\n{'='*70}")
         print(f"SUMMARY STATISTICS")
         print(f"{'='*70}")
         
         print(f"\n📊 Data Overview:")
-        print(f"   Raw records:        {len(raw_df):,}")
+        print(f"   Raw records:        {raw_table.num_rows:,}")
         print(f"   Aggregated bins:    {len(agg_df):,}")
-        print(f"   Compression ratio:  {100*len(agg_df)/len(raw_df):.1f}%")
+        print(f"   Compression ratio:  {100*len(agg_df)/raw_table.num_rows:.1f}%")
         
-        if 'region' in raw_df.columns:
-            print(f"   Region:             {raw_df['region'].iloc[0]}")
+        if 'region' in columns:
+            print(f"   Region:             {raw_table.column('region')[0].as_py()}")
         
-        if 'year' in raw_df.columns and 'quarter' in raw_df.columns:
-            periods = raw_df.groupby(['year', 'quarter']).size().to_dict()
+        if 'year' in columns and 'quarter' in columns:
+            periods = raw_table.group_by(['year', 'quarter']).aggregate([([], 'count_all')])
             print(f"\n📅 Time Periods:")
-            for (year, quarter), count in sorted(periods.items()):
+            for year, quarter, count in sorted(zip(*periods.select(['year', 'quarter', 'count_all']).to_pydict().values())):
                 print(f"   • {year} Q{quarter}: {count:,} records")
         
-        if 'data_type' in raw_df.columns:
-            types = raw_df.groupby('data_type').size().to_dict()
+        if 'data_type' in columns:
+            types = raw_table.group_by('data_type').aggregate([([], 'count_all')])
             print(f"\n📱 Data Types:")
-            for dtype, count in types.items():
+            for dtype, count in sorted(zip(*types.select(['data_type', 'count_all']).to_pydict().values())):
                 print(f"   • {dtype}: {count:,} records")
         
-        if 'avg_d_mbps' in raw_df.columns:
+        if 'avg_d_mbps' in columns:
             print(f"\n⚡ Average Speeds:")
-            print(f"   Download: {raw_df['avg_d_mbps'].mean():.2f} Mbps")
-            print(f"   Upload:   {raw_df['avg_u_mbps'].mean():.2f} Mbps")
+            print(f"   Download: {pc.mean(raw_table.column('avg_d_mbps')).as_py():.2f} Mbps")
+            print(f"   Upload:   {pc.mean(raw_table.column('avg_u_mbps')).as_py():.2f} Mbps")
         
-        if 'tests' in raw_df.columns:
-            print(f"\n🧪 Total Tests: {raw_df['tests'].sum():,}")
+        if 'tests' in columns:
+            print(f"\n🧪 Total Tests: {pc.sum(raw_table.column('tests')).as_py():,}")
         
         print(f"\n{'='*70}")
         print(f"✅ DATA READY FOR TABLEAU!")
@@ -522,6 +1246,36 @@ class TableauDataPreparer:
         print(f"\n")
 
 
+def _print_file_header(file_path):
+    """Print the banner that starts each file's progress in INDIVIDUAL mode"""
+    print(f"\n{'─'*70}")
+    print(f"Processing: {file_path.name}")
+    print(f"{'─'*70}")
+
+
+def _prepare_single_file_worker(task):
+    """
+    Prepare one file in a worker process
+    
+    Defined at module level so ProcessPoolExecutor can pickle it. Progress
+    printed while processing is captured and returned, so the parent can
+    print it without interleaving output from different files.
+    
+    Parameters:
+        task (tuple): (file_path, output_dir)
+    
+    Returns:
+        tuple: (dict of output paths, captured progress text)
+    """
+    file_path, output_dir = task
+    progress = io.StringIO()
+    with redirect_stdout(progress):
+        _print_file_header(file_path)
+        file_outputs = TableauDataPreparer(output_dir)._prepare_single_file(file_path)
+    
+    return file_outputs, progress.getvalue()
+
+
 def prepare_tableau_data(file_paths, output_name=None):
     """
     Convenience function to prepare Tableau data
@@ -531,7 +1285,7 @@ def prepare_tableau_data(file_paths, output_name=None):
         output_name (str, optional): Base name for output files
     
     Returns:
-        dict: Paths to generated Excel files
+        dict: Paths to generated Excel files (lists of part files when split)
     
     Example:
         >>> files = ['sumatra_2024_Q3_mobile.geoparquet']